@@ -0,0 +1,353 @@
+"""
+Batch scoring: many repos in, one JSON payload per repo out (JSONL).
+
+Shares the payload shape with `main.py score --format json`, plus a
+`dedupe` block per repo. Identical READMEs are evaluated once and the
+result fanned out; with near-dedupe on, near-duplicates (forks, template
+clones) share a cluster ID and can optionally reuse their cluster
+representative's result.
+"""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+PAYLOAD_VERSION = "0.3.0"
+
+# Fixed dimension order — must stay stable across versions.
+DIM_ORDER = [
+    "problem_clarity",
+    "novelty_trend_fit",
+    "distribution_potential",
+    "execution_quality",
+]
+
+
+def build_payload(
+    repo: str,
+    ref: str,
+    res,
+    ev,
+    *,
+    dim_scores=None,
+    docs_followed_url: str | None = None,
+    docs_fetch_ok: int = 0,
+) -> dict:
+    """
+    JSON payload for one scored repo.
+
+    Top-level key order: version, repo, readme, source, overall, scores,
+    signals, then docs debug fields. dim_scores overrides ev.scores (LLM path).
+    Partial runs (--dimensions) report only those scores, and overall is None:
+    the weights only mean something over all four dimensions.
+    """
+    from scoring_schema import calculate_overall_score
+
+    dim_scores = dim_scores if dim_scores is not None else ev.scores
+    overall = None
+    if all(dim in dim_scores for dim in DIM_ORDER):
+        overall = calculate_overall_score({k: v.score for k, v in dim_scores.items()})
+
+    return {
+        "version": PAYLOAD_VERSION,
+        "repo": f"{repo}@{ref}",
+        "readme": res.filename,
+        "source": res.source_url,
+        "overall": overall,
+        "scores": {
+            dim: {"score": dim_scores[dim].score, "why": dim_scores[dim].why}
+            for dim in DIM_ORDER
+            if dim in dim_scores
+        },
+        "signals": dict(sorted(ev.signals.items())),
+        "docs_followed_url": docs_followed_url,
+        "docs_fetch_ok": docs_fetch_ok,
+        "docs_signals_used": ev.docs_signals_applied,
+    }
+
+
+def read_repo_list(path: str) -> List[str]:
+    """One owner/name per line; blank lines and # comments ignored; duplicates dropped."""
+    repos: List[str] = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            repo = line.split("#", 1)[0].strip()
+            if repo and repo not in seen:
+                seen.add(repo)
+                repos.append(repo)
+    return repos
+
+
+@dataclass
+class BatchSummary:
+    shard: str = ""  # "i/N" for sharded runs
+    repos: int = 0
+    fetched: int = 0
+    fetch_errors: int = 0
+    unique_readmes: int = 0
+    clusters: int = 0
+    evaluations: int = 0
+    reused_exact: int = 0
+    reused_near: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+    def as_dict(self) -> dict:
+        return dict(self.__dict__)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+
+def run_batch(
+    repos: List[str],
+    *,
+    ref: str = "main",
+    workers: int = 4,
+    near_dedupe: bool = False,
+    skip_near_duplicates: bool = False,
+    near_threshold: float = 0.8,
+    max_chars: int | None = None,
+    dimensions: List[str] | None = None,
+    llm_scorer=None,
+) -> Tuple[List[dict], BatchSummary]:
+    """
+    Fetch, dedupe and score repos. Records come back in input order.
+
+    Fetch failures become {"repo", "error"} records instead of aborting
+    the batch — one missing README shouldn't cost the other thousand.
+
+    Near-duplicate clustering is opt-in (near_dedupe): it only saves
+    evaluations with skip_near_duplicates, which turns it on. Otherwise
+    clusters are exact-duplicate groups.
+
+    With an llm_scorer (llm_scorer.LLMScorer), each evaluated README is
+    also sent through score_many, batched under its token budget; its
+    scores replace the heuristic ones, which stay as the fallback and
+    keep the signals. Reused results reuse the LLM scores too.
+    """
+    from dedupe import dedupe
+    from evaluator import evaluate_readme
+    from github_fetcher import fetch_readme
+
+    summary = BatchSummary(repos=len(repos))
+
+    def _fetch(repo: str):
+        try:
+            return fetch_readme(repo, ref), None
+        except Exception as e:
+            return None, str(e)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        fetched = list(pool.map(_fetch, repos))
+
+    ok: Dict[str, object] = {}
+    for repo, (res, _) in zip(repos, fetched):
+        if res is not None:
+            ok[repo] = res
+    summary.fetched = len(ok)
+    summary.wire_bytes = sum(res.wire_bytes for res in ok.values())
+    summary.decoded_bytes = sum(res.decoded_bytes for res in ok.values())
+    summary.fetch_errors = len(repos) - len(ok)
+
+    dd = dedupe(
+        [(repo, res.text) for repo, res in ok.items()],
+        threshold=near_threshold,
+        near=near_dedupe or skip_near_duplicates,
+    )
+    summary.unique_readmes = len(dd.exact_groups)
+    summary.clusters = len(dd.representative)
+    sizes = dd.cluster_sizes
+
+    evals: Dict[str, object] = {}  # content hash -> EvalResult
+    texts: Dict[str, str] = {}  # content hash -> README text that was evaluated
+    scored: List[Tuple[int, str, object, str, dict]] = []  # (index, repo, res, source hash, dedupe)
+    records: List[dict] = []
+    for repo, (res, err) in zip(repos, fetched):
+        if res is None:
+            records.append({"repo": f"{repo}@{ref}", "error": err})
+            continue
+
+        h = dd.content_hash[repo]
+        cid = dd.cluster_id[repo]
+        reused_from = None
+        source_hash = h
+        if skip_near_duplicates:
+            source_hash = dd.content_hash[dd.representative[cid]]
+
+        if source_hash in evals:
+            # Representatives come first in input order, so they're always scored first.
+            reused_from = dd.exact_groups[source_hash][0]
+            if source_hash == h:
+                summary.reused_exact += 1
+            else:
+                summary.reused_near += 1
+        else:
+            evals[source_hash] = evaluate_readme(res.text, max_chars=max_chars, dimensions=dimensions)
+            texts[source_hash] = res.text
+            summary.evaluations += 1
+
+        block = {
+            "content_hash": h,
+            "cluster_id": cid,
+            "cluster_size": sizes[cid],
+            "reused_from": reused_from,
+        }
+        scored.append((len(records), repo, res, source_hash, block))
+        records.append({})  # filled in below, once the scores are final
+
+    llm_results: Dict[str, object] = {}  # content hash -> LLMScoreResult
+    if llm_scorer is not None and evals:
+        order = list(evals)
+        results = llm_scorer.score_many([texts[h] for h in order], fallbacks=[evals[h] for h in order])
+        llm_results = dict(zip(order, results))
+
+    for i, repo, res, source_hash, block in scored:
+        ev = evals[source_hash]
+        dim_scores = None
+        llm_result = llm_results.get(source_hash)
+        if llm_result is not None and llm_result.backend == "llm":
+            dim_scores = {
+                dim: ds
+                for dim, ds in llm_result.scores.items()
+                if dimensions is None or dim in dimensions
+            }
+        payload = build_payload(repo, ref, res, ev, dim_scores=dim_scores)
+        if llm_result is not None:
+            payload["scorer"] = llm_result.backend
+            payload["scorer_error"] = llm_result.error
+        payload["dedupe"] = block
+        records[i] = payload
+
+    return records, summary
+
+
+# --- merging shard outputs ---
+
+
+def merge_results(paths: List[str]) -> List[dict]:
+    """
+    Combine batch JSONL files into one deduplicated result set.
+
+    Records are keyed by "owner/name@ref". A scored record beats an error
+    record for the same repo (a retry on another node succeeded); between
+    two scored records the first file wins. Output is sorted by repo so the
+    merge is independent of shard order, and `dedupe` blocks are rebuilt
+    over the merged set.
+    """
+    merged: Dict[str, dict] = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                rec = json.loads(line)
+                prev = merged.get(rec["repo"])
+                if prev is None or ("error" in prev and "error" not in rec):
+                    merged[rec["repo"]] = rec
+    records = [merged[key] for key in sorted(merged)]
+    _rebuild_dedupe(records)
+    return records
+
+
+def _rebuild_dedupe(records: List[dict]) -> None:
+    """
+    Recompute `dedupe` blocks over the merged set, in place.
+
+    Shard blocks only saw their own shard: the same README on two shards
+    came back as two size-1 clusters, each evaluated. Clusters here join
+    records that share a content hash or a shard cluster ID; reused_from
+    points at the first record, in merged order, holding the README the
+    scores came from.
+
+    Only exact duplicates are joined across shards. Records carry hashes,
+    not README text or MinHash signatures, so near duplicates that landed
+    on different shards with no content hash in common stay separate
+    clusters (an unsharded run would have joined them).
+    """
+    scored = [r for r in records if "dedupe" in r]
+    by_repo = {r["repo"]: r for r in scored}
+
+    parent: Dict[str, str] = {}
+
+    def find(x: str) -> str:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for r in scored:
+        d = r["dedupe"]
+        ra, rb = find("h:" + d["content_hash"]), find("c:" + d["cluster_id"])
+        if ra != rb:
+            parent[rb] = ra
+
+    first_cid: Dict[str, str] = {}  # component root -> cluster ID of its first record
+    sizes: Dict[str, int] = {}
+    first_by_hash: Dict[str, str] = {}  # content hash -> first repo (no @ref) holding it
+    for r in scored:
+        d = r["dedupe"]
+        root = find("h:" + d["content_hash"])
+        first_cid.setdefault(root, d["cluster_id"])
+        sizes[root] = sizes.get(root, 0) + 1
+        first_by_hash.setdefault(d["content_hash"], r["repo"].rsplit("@", 1)[0])
+
+    for r in scored:
+        d = r["dedupe"]
+        name, _, ref = r["repo"].rpartition("@")
+        source_hash = d["content_hash"]
+        if d["reused_from"] is not None:
+            # Near reuse: the scores came from another README; keep that source.
+            source = by_repo.get(f"{d['reused_from']}@{ref}")
+            if source is not None:
+                source_hash = source["dedupe"]["content_hash"]
+        root = find("h:" + d["content_hash"])
+        first = first_by_hash[source_hash]
+        d["cluster_id"] = first_cid[root]
+        d["cluster_size"] = sizes[root]
+        d["reused_from"] = None if first == name else first
+
+
+def merge_summaries(summaries: List[dict], records: List[dict] | None = None) -> dict:
+    """
+    Sum per-shard BatchSummary counters.
+
+    With the merged records, the per-repo counters are recomputed from them
+    instead: fetched / fetch_errors from which records carry an "error"
+    (a repo that failed on one shard and succeeded on another is fetched
+    once), and the dedupe counters (unique_readmes, clusters, evaluations,
+    reused_*) from their rebuilt `dedupe` blocks, since the same README can
+    be unique on two shards. They then match what one unsharded run would
+    report.
+    """
+    out = {k: 0 for k in BatchSummary().as_dict() if k != "shard"}
+    for summary in summaries:
+        for key, value in summary.items():
+            if key in out and isinstance(value, int):
+                out[key] += value
+    out["shards"] = len(summaries)
+    if records is not None:
+        out["repos"] = len(records)
+        out["fetch_errors"] = sum(1 for r in records if "error" in r)
+        out["fetched"] = len(records) - out["fetch_errors"]
+        blocks = [r["dedupe"] for r in records if "dedupe" in r]
+        hashes = {d["content_hash"] for d in blocks}
+        # Reuse from a different README means a near-duplicate reuse.
+        first = {}
+        for r in records:
+            if "dedupe" in r:
+                first.setdefault(r["dedupe"]["content_hash"], r["repo"].rsplit("@", 1)[0])
+        reused = [d for d in blocks if d["reused_from"] is not None]
+        out["unique_readmes"] = len(hashes)
+        out["clusters"] = len({d["cluster_id"] for d in blocks})
+        out["evaluations"] = len(blocks) - len(reused)
+        out["reused_exact"] = sum(1 for d in reused if first[d["content_hash"]] == d["reused_from"])
+        out["reused_near"] = len(reused) - out["reused_exact"]
+    return out
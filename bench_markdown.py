@@ -0,0 +1,147 @@
+"""
+Benchmark: legacy per-cue regex scans vs one markdown_doc.parse_markdown pass.
+
+The legacy side reproduces exactly the scans the README structural cues and
+extract_docs_url used to make (images, badges, fences, bullets, steps, docs
+link, then the three docs-URL strategies). The new side parses once and
+answers the same questions from the document model.
+
+Cases: this repo's own Markdown files (prose-heavy, like most READMEs) and
+a synthetic worst case where nearly every line is a list item, heading or
+fence, i.e. where the model has the most tokens to build.
+
+The score columns run the `score --max-chars` path: docs-link extraction
+plus evaluate_readme, which selects sections from the full README before
+scanning. "x2" parses the full README twice (docs link, sectioniser), "x1"
+shares one parse.
+
+    python bench_markdown.py [--sections 400] [--repeat 20] [--max-chars 4000] > bench_output.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import re
+import time
+
+from evaluator import evaluate_readme
+from github_fetcher import extract_docs_url
+from markdown_doc import parse_markdown
+
+
+def synthetic_readme(sections: int) -> str:
+    parts = ["# Project", "[![ci](https://img.shields.io/badge/ci-passing-green)](https://ci.example.com)", ""]
+    for i in range(sections):
+        parts += [
+            f"## Section {i}",
+            f"Some prose about feature {i}, see https://example.com/blog/{i} for details.",
+            "",
+            "1. Install the thing",
+            "2. Configure it",
+            "- bullet one",
+            "- bullet two",
+            "",
+            "```bash",
+            f"pip install project-{i}",
+            "# comment that looks like a heading",
+            "```",
+            "",
+        ]
+    parts.append("Read the [documentation](https://example.com/docs/start) for more.")
+    return "\n".join(parts)
+
+
+def legacy_scans(text: str) -> tuple:
+    has_badges = re.search(r"(?i)img\.shields\.io/", text) is not None
+    has_images = re.search(r"!\[.*?\]\(.*?\)", text) is not None
+    fences = len(re.findall(r"```", text)) // 2 + len(re.findall(r"~~~", text)) // 2
+    bullets = len(re.findall(r"(?m)^\s*([-*]|•)\s+", text))
+    steps = len(re.findall(r"(?im)^\s*(\d+\.\s+|\d+\)\s+|step\s*\d+\s*:)", text))
+    docs_link = re.search(r"(?i)\b(docs|documentation)\b", text) and re.search(r"https?://\S+", text)
+    url = None
+    m = re.search(
+        r"\[(?:[^\]]*(?:docs|documentation|getting\s+started)[^\]]*)\]\((https?://[^\s)]+)\)", text, re.IGNORECASE
+    )
+    if m:
+        url = m.group(1)
+    else:
+        m = re.search(r"(https?://\S+/(?:docs|documentation)\b\S*)", text, re.IGNORECASE)
+        if m:
+            url = m.group(1)
+        else:
+            for line in text.splitlines():
+                if re.search(r"(?i)\b(?:docs|documentation)\b", line):
+                    m = re.search(r"(https?://\S+)", line)
+                    if m:
+                        url = m.group(1)
+                        break
+    return has_badges, has_images, fences, bullets, steps, bool(docs_link), url
+
+
+def model_scans(text: str) -> tuple:
+    doc = parse_markdown(text)
+    return (
+        any("img.shields.io/" in img.url for img in doc.images),
+        bool(doc.images),
+        len(doc.code_blocks),
+        doc.bullets,
+        doc.steps,
+        bool(doc.urls),
+        extract_docs_url(text, doc=doc),
+    )
+
+
+def _best(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sections", type=int, default=400, help="size of the synthetic worst case")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--max-chars", type=int, default=4000, help="score budget (sections are selected above it)")
+    args = ap.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    cases = [
+        (os.path.relpath(path, here), open(path, encoding="utf-8").read())
+        for path in [os.path.join(here, "README.md")] + sorted(glob.glob(os.path.join(here, "docs", "*.md")))
+    ]
+    cases.append((f"synthetic x{args.sections} (dense)", synthetic_readme(args.sections)))
+
+    def score_shared(t: str) -> None:
+        doc = parse_markdown(t)
+        extract_docs_url(t, doc=doc)
+        evaluate_readme(t, doc=doc, max_chars=args.max_chars)
+
+    def score_unshared(t: str) -> None:
+        extract_docs_url(t)
+        evaluate_readme(t, max_chars=args.max_chars)
+
+    print(f"best of {args.repeat}; times in ms")
+    print(f"{'case':<36} {'chars':>8} {'legacy':>8} {'model':>8} {'speedup':>8} {'score x2':>9} {'score x1':>9}")
+    for name, text in cases:
+        legacy = _best(legacy_scans, text, args.repeat)
+        model = _best(model_scans, text, args.repeat)
+        unshared = _best(score_unshared, text, args.repeat)
+        shared = _best(score_shared, text, args.repeat)
+        print(
+            f"{name:<36} {len(text):>8,} {legacy * 1e3:>8.3f} {model * 1e3:>8.3f} {legacy / model:>7.2f}x"
+            f" {unshared * 1e3:>9.3f} {shared * 1e3:>9.3f}"
+        )
+    print(
+        "legacy/model: structural cues + docs URL only; "
+        f"score x2/x1: docs URL + evaluate --max-chars {args.max_chars}, full README parsed twice vs once"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
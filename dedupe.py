@@ -0,0 +1,187 @@
+"""
+README dedupe: exact content hashes + MinHash/LSH near-duplicate clusters.
+
+Why this exists:
+- big corpora are full of forks, mirrors and template clones whose READMEs
+  are identical or differ by a name and a badge
+- scoring is deterministic, so identical text only needs evaluating once
+- near-duplicates get the same cluster ID, so they can be grouped in
+  analysis or (optionally) skipped entirely
+
+stdlib-only: each word is hashed once, each shingle is one tuple hash of
+its word hashes, and the signature uses one-permutation hashing: the hash picks one of num_perm
+bins and the rest of its bits compete for that bin's minimum. That's one
+pass over the shingles instead of num_perm, and empty bins borrow from
+the next non-empty one (rotation densification, Shrivastava & Li 2014) so
+signatures of short texts still compare position by position.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+_MASK_64 = (1 << 64) - 1
+_EMPTY = 1 << 64  # larger than any bin value
+_DENSIFY_OFFSET = 1 << 64
+_WORD = re.compile(r"\w+")
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash for exact-duplicate grouping.
+
+    Line endings and trailing whitespace are normalised first: a README
+    checked out on Windows is still the same README.
+    """
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    norm = "\n".join(line.rstrip() for line in lines).strip("\n")
+    return hashlib.sha256(norm.encode("utf-8")).hexdigest()
+
+
+def shingles(text: str, k: int = 5) -> set:
+    """
+    Hashed word k-shingles (lowercased). Short texts fall back to one shingle.
+
+    Each word is hashed once (crc32) and a shingle is the hash of its
+    k-tuple of word hashes. Tuple-of-int hashing is deterministic across
+    processes (unlike str hashing), so signatures are stable between runs.
+    """
+    words = _WORD.findall(text.lower())
+    ids = list(map(zlib.crc32, map(str.encode, words)))
+    if len(ids) < k:
+        return {hash(tuple(ids)) & _MASK_64}
+    return {hash(gram) & _MASK_64 for gram in zip(*(ids[j:] for j in range(k)))}
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        self.num_perm = num_perm
+        # XOR salt: a different seed is a different (fixed) permutation of hashes.
+        self._salt = random.Random(seed).getrandbits(64)
+
+    def signature(self, shingle_set: set) -> Tuple[int, ...]:
+        k = self.num_perm
+        if not shingle_set:
+            return tuple([_EMPTY] * k)
+        bins = [_EMPTY] * k
+        salt = self._salt
+        for x in shingle_set:
+            x ^= salt
+            b = (x * k) >> 64  # bin from the high bits, which mix best
+            if x < bins[b]:
+                bins[b] = x
+        if _EMPTY in bins:
+            # Each empty bin takes the next non-empty bin's value (wrapping),
+            # offset by the distance so borrowed values don't collide by accident.
+            filled = [i for i, v in enumerate(bins) if v != _EMPTY]
+            out = list(bins)
+            for i, v in enumerate(bins):
+                if v == _EMPTY:
+                    j = next((f for f in filled if f > i), filled[0] + k)
+                    out[i] = bins[j % k] + (j - i) * _DENSIFY_OFFSET
+            bins = out
+        return tuple(bins)
+
+
+def estimate_jaccard(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    same = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return same / len(sig_a)
+
+
+@dataclass(frozen=True)
+class DedupeResult:
+    content_hash: Dict[str, str]  # key -> content hash
+    cluster_id: Dict[str, str]  # key -> cluster ID (shared by exact + near duplicates)
+    representative: Dict[str, str]  # cluster ID -> first key in input order
+    exact_groups: Dict[str, List[str]]  # content hash -> keys, input order
+
+    @property
+    def cluster_sizes(self) -> Dict[str, int]:
+        sizes: Dict[str, int] = {}
+        for cid in self.cluster_id.values():
+            sizes[cid] = sizes.get(cid, 0) + 1
+        return sizes
+
+
+def dedupe(
+    items: List[Tuple[str, str]],
+    *,
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    bands: int = 16,
+    near: bool = True,
+) -> DedupeResult:
+    """
+    Group (key, text) items into exact groups and near-duplicate clusters.
+
+    Exact grouping is by content_hash. Near-duplicates are found per unique
+    text via LSH (bands x rows = num_perm) and confirmed against the
+    MinHash Jaccard estimate before being merged (union-find), so LSH
+    false positives don't chain unrelated READMEs together.
+
+    Cluster IDs are the first 12 hex chars of the first member's content
+    hash, so they're stable across runs with the same input order.
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+    hashes: Dict[str, str] = {}
+    exact_groups: Dict[str, List[str]] = {}
+    unique_text: Dict[str, str] = {}
+    for key, text in items:
+        h = content_hash(text)
+        hashes[key] = h
+        exact_groups.setdefault(h, []).append(key)
+        unique_text.setdefault(h, text)
+
+    order = list(exact_groups)  # first-seen order
+    rank = {h: i for i, h in enumerate(order)}
+    parent = {h: h for h in order}
+
+    def find(h: str) -> str:
+        while parent[h] != h:
+            parent[h] = parent[parent[h]]
+            h = parent[h]
+        return h
+
+    if near and len(order) > 1:
+        hasher = MinHasher(num_perm=num_perm)
+        rows = num_perm // bands
+        sigs = {h: hasher.signature(shingles(unique_text[h])) for h in order}
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        for h in order:
+            sig = sigs[h]
+            for b in range(bands):
+                buckets.setdefault((b, sig[b * rows : (b + 1) * rows]), []).append(h)
+
+        # Union each bucket member with the bucket's first member, not all
+        # pairs: template clones can put thousands of READMEs in one bucket.
+        for members in buckets.values():
+            first = members[0]
+            for b in members[1:]:
+                ra, rb = find(first), find(b)
+                if ra == rb or estimate_jaccard(sigs[first], sigs[b]) < threshold:
+                    continue
+                # Keep the earlier-seen root so IDs follow input order.
+                if rank[ra] > rank[rb]:
+                    ra, rb = rb, ra
+                parent[rb] = ra
+
+    cluster_id: Dict[str, str] = {}
+    representative: Dict[str, str] = {}
+    for key, _ in items:
+        cid = find(hashes[key])[:12]
+        cluster_id[key] = cid
+        representative.setdefault(cid, key)
+
+    return DedupeResult(
+        content_hash=hashes,
+        cluster_id=cluster_id,
+        representative=representative,
+        exact_groups=exact_groups,
+    )
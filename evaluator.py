@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Dict
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from markdown_doc import Document, parse_markdown
 
 
 @dataclass(frozen=True)
@@ -16,6 +18,7 @@ class EvalResult:
     scores: Dict[str, DimensionScore]
     signals: Dict[str, int]  # debug: observed cues / counts
     docs_signals_applied: list  # docs signals that actually changed scoring (not just detected)
+    signal_cost: int = 0  # summed Signal.cost of the signals actually computed
 
 
 def _count(pattern: str, text: str, flags: int = 0) -> int:
@@ -26,138 +29,242 @@ def _has(pattern: str, text: str, flags: int = 0) -> bool:
     return re.search(pattern, text, flags) is not None
 
 
-def _count_fenced_code_blocks(text: str) -> int:
-    """
-    Rough count of fenced code blocks.
+# --- Signal registry ---
+#
+# Every cue the rules look at is declared once here: how to compute it, a
+# rough relative cost, and which other signals it reads. Signals are
+# computed lazily and memoised per document (SignalContext), so a rule that
+# short-circuits never pays for the scans it skipped, and scoring a single
+# dimension only computes what that dimension's rule touches.
+#
+# Structural cues (headings, fences, list items, links, images) come from the
+# shared single-pass document model (markdown_doc), parsed at most once per
+# text; keyword cues are one regex search each.
+#
+# cost: 1 = one regex search or a lookup in the parsed document,
+#       2 = full-text count / two searches, 0 = derived.
 
-    Why this exists:
-    - many READMEs use ``` fences, some use ~~~ fences
-    - we don't need perfect parsing; we just want a "does it show runnable stuff?" signal
-    """
-    ticks = _count(r"```", text)
-    tildes = _count(r"~~~", text)
-    return (ticks // 2) + (tildes // 2)
+_INSTALL = r"(?i)\b(install|installation|get(ting)? started|setup|set up|requirements|prerequisite|dependencies)\b"
+_USAGE = r"(?i)\b(usage|quick\s*start|quickstart|examples?|how to|run|try it|getting\s+started|cli|commands?)\b"
+_ONE_COMMAND = r"(?i)\b(npx\s+\S+|pip\s+install\s+\S+|curl\s+.+\|\s*(sh|bash)|docker\s+run\s+\S+)\b"
 
 
-def evaluate_readme(readme_text: str, *, docs_text: str | None = None) -> EvalResult:
-    """
-    Heuristic v0.3 evaluator (README-first, optional docs supplement).
+@dataclass(frozen=True)
+class Signal:
+    name: str
+    compute: Callable[["SignalContext"], int]
+    cost: int = 1
+    deps: Tuple[str, ...] = ()
+    pattern: str | None = None
+    public: bool = True  # reported in EvalResult.signals (debug output)
+
+
+SIGNALS: Dict[str, Signal] = {}
+
+
+def register_signal(
+    name: str,
+    *,
+    cost: int = 1,
+    deps: Iterable[str] = (),
+    pattern: str | None = None,
+    public: bool = True,
+):
+    """Decorator: register a compute function as a named signal."""
+
+    def wrap(fn: Callable[["SignalContext"], int]):
+        if name in SIGNALS:
+            raise ValueError(f"Signal already registered: {name}")
+        for dep in deps:
+            if dep not in SIGNALS:
+                raise ValueError(f"Signal {name} depends on unknown signal: {dep}")
+        SIGNALS[name] = Signal(name, fn, cost, tuple(deps), pattern, public)
+        return fn
+
+    return wrap
+
+
+def _pattern_signal(
+    name: str,
+    pattern: str,
+    *,
+    docs: bool = False,
+    count: bool = False,
+    cost: int | None = None,
+    public: bool = True,
+) -> None:
+    """Register a signal that is one regex search (or count) over README or docs text."""
+
+    def compute(ctx: "SignalContext") -> int:
+        text = ctx.docs_text if docs else ctx.text
+        if not text:
+            return 0
+        return _count(pattern, text) if count else int(_has(pattern, text))
+
+    register_signal(
+        name, cost=cost if cost is not None else (2 if count else 1), pattern=pattern, public=public
+    )(compute)
+
+
+class SignalContext:
+    """Lazy, memoised signal values for one README (+ optional docs page)."""
+
+    def __init__(self, text: str, docs_text: str | None = None, doc: Document | None = None) -> None:
+        self.text = text
+        self.docs_text = docs_text
+        self.values: Dict[str, int] = {}
+        self.cost = 0
+        self.docs_applied: List[str] = []
+        self._doc = doc
+        self._docs_doc: Document | None = None
+
+    # Parsing is the one full pass over the text; it counts once, like a signal.
+    _PARSE_COST = 2
+
+    @property
+    def doc(self) -> Document:
+        if self._doc is None:
+            self._doc = parse_markdown(self.text)
+            self.cost += self._PARSE_COST
+        return self._doc
+
+    @property
+    def docs_doc(self) -> Document | None:
+        if self._docs_doc is None and self.docs_text:
+            self._docs_doc = parse_markdown(self.docs_text)
+            self.cost += self._PARSE_COST
+        return self._docs_doc
+
+    def __getitem__(self, name: str) -> int:
+        if name not in self.values:
+            sig = SIGNALS[name]
+            self.values[name] = int(sig.compute(self))
+            self.cost += sig.cost
+        return self.values[name]
+
+
+def estimated_cost(names: Iterable[str]) -> int:
+    """Worst-case cost of computing these signals, dependencies included."""
+    seen: set = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in seen:
+            seen.add(name)
+            stack.extend(SIGNALS[name].deps)
+    return sum(SIGNALS[n].cost for n in seen)
+
+
+# --- README signals (public: reported for debugging) ---
+
+# TL;DR / one-line / summary-ish cues
+_pattern_signal("has_tldr", r"(?i)\b(tl;dr|tldr|one[- ]line|summary|in short)\b")
+# "Install/Usage" headers are common, but plenty of repos don't use those exact words.
+# We try to catch onboarding sections that still function as install/usage.
+_pattern_signal("has_install", _INSTALL)
+_pattern_signal("has_usage", _USAGE)
+# Also detect "one-command" onboarding (npx, curl | bash, pip install, etc.)
+_pattern_signal("has_one_command", _ONE_COMMAND)
+
+
+# Any level-1 heading outside code: ATX "# Title" or a setext "Title / ===" pair.
+@register_signal("has_title")
+def _has_title(ctx: SignalContext) -> int:
+    return int(any(h.level == 1 and h.text for h in ctx.doc.headings))
+
+
+@register_signal("has_badges")
+def _has_badges(ctx: SignalContext) -> int:
+    return int(any("img.shields.io/" in img.url for img in ctx.doc.images))
+
+
+# Steps: "1." / "1)" / "Step 1:" outside code blocks
+@register_signal("step_lines")
+def _step_lines(ctx: SignalContext) -> int:
+    return ctx.doc.steps
 
-    What we're trying to measure:
-    - "star-worthiness signals" as they appear to a reader skimming the README
-    - not code quality, not algorithmic difficulty
 
-    This is intentionally conservative:
-    - if a README doesn't *show* evidence, we don't give it credit
+# Bullets: -, *, or unicode bullet, outside code blocks
+@register_signal("bullets")
+def _bullets(ctx: SignalContext) -> int:
+    return ctx.doc.bullets
+
+
+@register_signal("code_blocks")
+def _code_blocks(ctx: SignalContext) -> int:
+    return len(ctx.doc.code_blocks)
+
 
-    docs_text: when --follow-docs is used, the fetched docs page text.
-    Signals from docs are tracked separately (docs_* prefix) for traceability.
-    Only execution_quality uses docs evidence — the other dimensions stay
-    README-only, since they measure first-screen impression.
-    """
-    t = readme_text
+@register_signal("has_demo", cost=2)
+def _has_demo(ctx: SignalContext) -> int:
+    # Demo-ish cues: explicit words OR any markdown image
+    return int(
+        bool(ctx.doc.images) or _has(r"(?i)\b(demo|screenshot|gif|video|preview)\b", ctx.text)
+    )
 
-    # --- Observable signals (debug-friendly) ---
-    has_title = _has(r"(?m)^\s*#\s+\S+", t)
 
-    # TL;DR / one-line / summary-ish cues
-    has_tldr = _has(r"(?i)\b(tl;dr|tldr|one[- ]line|summary|in short)\b", t)
+@register_signal("has_docs_link", cost=2)
+def _has_docs_link(ctx: SignalContext) -> int:
+    return int(bool(ctx.doc.urls) and _has(r"(?i)\b(docs|documentation)\b", ctx.text))
 
-    # "Install/Usage" headers are common, but plenty of repos don't use those exact words.
-    # We try to catch onboarding sections that still function as install/usage.
-    has_install = _has(
-        r"(?i)\b(install|installation|get(ting)? started|setup|set up|requirements|prerequisite|dependencies)\b",
-        t,
-    )
-    has_usage = _has(
-        r"(?i)\b(usage|quick\s*start|quickstart|examples?|how to|run|try it|getting\s+started|cli|commands?)\b",
-        t,
-    )
 
-    # Demo-ish cues: explicit words OR any markdown image
-    has_demo = (
-        _has(r"(?i)\b(demo|screenshot|gif|video|preview)\b", t)
-        or _has(r"!\[.*?\]\(.*?\)", t)
+@register_signal(
+    "docs_is_primary_onboarding",
+    cost=0,
+    deps=("has_docs_link", "has_install", "has_usage", "code_blocks", "step_lines"),
+)
+def _docs_is_primary_onboarding(ctx: SignalContext) -> int:
+    # Cheapest checks first; any miss ends the chain.
+    return int(
+        bool(ctx["has_install"] == 0 and ctx["has_usage"] == 0 and ctx["has_docs_link"])
+        and ctx["code_blocks"] == 0
+        and ctx["step_lines"] == 0
     )
-    
-    has_badges = _has(r"!\[.*?\]\(https?://img\.shields\.io/.*?\)", t)
 
-    code_blocks = _count_fenced_code_blocks(t)
 
-    # Steps: "1." / "1)" / "Step 1:" / "- Step:"
-    step_lines = _count(r"(?im)^\s*(\d+\.\s+|\d+\)\s+|step\s*\d+\s*:)", t)
+# --- Supplemental docs signals (only non-zero when --follow-docs provides text) ---
+# Tracked separately so score changes are traceable to their source.
 
-    # Bullets: -, *, or unicode bullet
-    bullets = _count(r"(?m)^\s*([-*]|•)\s+", t)
+_pattern_signal("docs_has_install", _INSTALL, docs=True)
+_pattern_signal("docs_has_usage", _USAGE, docs=True)
+_pattern_signal("docs_has_one_command", _ONE_COMMAND, docs=True)
 
-    has_docs_link = _has(r"(?i)\b(docs|documentation)\b", t) and _has(r"https?://\S+", t)
-    
-    docs_is_primary_onboarding = bool(has_docs_link and (not has_install) and 
-    (not has_usage) and code_blocks == 0 and step_lines == 0)
 
+@register_signal("docs_step_lines")
+def _docs_step_lines(ctx: SignalContext) -> int:
+    return ctx.docs_doc.steps if ctx.docs_text else 0
 
-    # Also detect "one-command" onboarding (npx, curl | bash, pip install, etc.)
-    has_one_command = _has(
-        r"(?i)\b(npx\s+\S+|pip\s+install\s+\S+|curl\s+.+\|\s*(sh|bash)|docker\s+run\s+\S+)\b",
-        t,
-    )
 
-    signals = {
-        "has_title": int(has_title),
-        "has_tldr": int(has_tldr),
-        "has_install": int(has_install),
-        "has_usage": int(has_usage),
-        "has_demo": int(has_demo),
-        "has_badges": int(has_badges),
-        "code_blocks": int(code_blocks),
-        "step_lines": int(step_lines),
-        "bullets": int(bullets),
-        "has_one_command": int(has_one_command),
-        "has_docs_link": int(has_docs_link),
-        "docs_is_primary_onboarding": int(docs_is_primary_onboarding),
-    }
-
-    # --- Supplemental docs signals (only when --follow-docs provides text) ---
-    # Tracked separately so score changes are traceable to their source.
-    docs_has_install = False
-    docs_has_usage = False
-    docs_code_blocks = 0
-    docs_step_lines = 0
-    docs_has_one_command = False
-
-    if docs_text:
-        docs_has_install = _has(
-            r"(?i)\b(install|installation|get(ting)? started|setup|set up|requirements|prerequisite|dependencies)\b",
-            docs_text,
-        )
-        docs_has_usage = _has(
-            r"(?i)\b(usage|quick\s*start|quickstart|examples?|how to|run|try it|getting\s+started|cli|commands?)\b",
-            docs_text,
-        )
-        docs_code_blocks = _count_fenced_code_blocks(docs_text)
-        docs_step_lines = _count(
-            r"(?im)^\s*(\d+\.\s+|\d+\)\s+|step\s*\d+\s*:)", docs_text
-        )
-        docs_has_one_command = _has(
-            r"(?i)\b(npx\s+\S+|pip\s+install\s+\S+|curl\s+.+\|\s*(sh|bash)|docker\s+run\s+\S+)\b",
-            docs_text,
-        )
-
-    signals["docs_has_install"] = int(docs_has_install)
-    signals["docs_has_usage"] = int(docs_has_usage)
-    signals["docs_code_blocks"] = int(docs_code_blocks)
-    signals["docs_step_lines"] = int(docs_step_lines)
-    signals["docs_has_one_command"] = int(docs_has_one_command)
-
-    # --- Dimension 1: problem_clarity ---
+@register_signal("docs_code_blocks")
+def _docs_code_blocks(ctx: SignalContext) -> int:
+    return len(ctx.docs_doc.code_blocks) if ctx.docs_text else 0
+
+
+# --- Rule-only cues (not reported; memoised like the rest) ---
+
+_pattern_signal("mentions_what_why", r"(?i)\b(what\s+it\s+is|what\s+this\s+is|why)\b", public=False)
+_pattern_signal("mentions_novelty", r"(?i)\b(new|novel|first|unique|different|opinionated)\b", public=False)
+_pattern_signal("mentions_trend", r"(?i)\b(agent|workflow|automation|benchmark|copy[- ]paste)\b", public=False)
+_pattern_signal(
+    "mentions_fast_success", r"(?i)\b(copy[- ]paste|3\s*minutes|one\s+command|zero\s+config)\b", public=False
+)
+_pattern_signal(
+    "mentions_requirements", r"(?i)\b(requirements|dependencies|python\s+>=|node\s+>=)\b", public=False
+)
+
+
+# --- Dimension rules ---
+
+
+def _problem_clarity(ctx: SignalContext) -> DimensionScore:
     pc = 3.0
-    if has_title:
+    if ctx["has_title"]:
         pc += 1.0
-    if has_tldr:
+    if ctx["has_tldr"]:
         pc += 1.5
-    if _has(r"(?i)\b(what\s+it\s+is|what\s+this\s+is|why)\b", t):
+    if ctx["mentions_what_why"]:
         pc += 1.0
-    if bullets >= 6:
+    if ctx["bullets"] >= 6:
         pc += 0.5
     pc = min(10.0, pc)
 
@@ -168,14 +275,16 @@ def evaluate_readme(readme_text: str, *, docs_text: str | None = None) -> EvalRe
         pc_why = "It’s not obvious who it’s for or what problem it solves from the first screen."
     else:
         pc_why = "It states what it is early, but the target user / problem framing could be sharper."
+    return DimensionScore(pc, pc_why)
+
 
-    # --- Dimension 2: novelty_trend_fit ---
+def _novelty_trend_fit(ctx: SignalContext) -> DimensionScore:
     nt = 4.0
-    if _has(r"(?i)\b(new|novel|first|unique|different|opinionated)\b", t):
+    if ctx["mentions_novelty"]:
         nt += 1.0
-    if _has(r"(?i)\b(agent|workflow|automation|benchmark|copy[- ]paste)\b", t):
+    if ctx["mentions_trend"]:
         nt += 1.0
-    if has_demo:
+    if ctx["has_demo"]:
         nt += 0.5
     nt = min(10.0, nt)
 
@@ -186,16 +295,20 @@ def evaluate_readme(readme_text: str, *, docs_text: str | None = None) -> EvalRe
         nt_why = "It reads like a standard library without a strong ‘why now / why different’ hook."
     else:
         nt_why = "It has a recognizable angle, but the differentiation claim isn’t strongly demonstrated yet."
+    return DimensionScore(nt, nt_why)
 
-    # --- Dimension 3: distribution_potential ---
+
+def _distribution_potential(ctx: SignalContext) -> DimensionScore:
     dp = 3.5
-    if has_demo:
+    if ctx["has_demo"]:
         dp += 2.0
-    if has_badges:
+    if ctx["has_badges"]:
         dp += 0.5
-    if (has_usage or has_one_command) and (step_lines >= 2 or code_blocks >= 1):
+    if (ctx["has_usage"] or ctx["has_one_command"]) and (
+        ctx["step_lines"] >= 2 or ctx["code_blocks"] >= 1
+    ):
         dp += 1.5
-    if _has(r"(?i)\b(copy[- ]paste|3\s*minutes|one\s+command|zero\s+config)\b", t):
+    if ctx["mentions_fast_success"]:
         dp += 1.0
     dp = min(10.0, dp)
 
@@ -205,45 +318,51 @@ def evaluate_readme(readme_text: str, *, docs_text: str | None = None) -> EvalRe
         dp_why = "There’s little reason to share it: no visible payoff, demo, or quick success path."
     else:
         dp_why = "It’s shareable if people can ‘see the payoff’ quickly."
+    return DimensionScore(dp, dp_why)
+
+
+def _execution_quality(ctx: SignalContext) -> DimensionScore:
+    # README-first onboarding quality.
+    has_install = ctx["has_install"] or ctx["has_one_command"]
+    has_usage = ctx["has_usage"]
 
-    # --- Dimension 4: execution_quality (README-first onboarding quality) ---
     eq = 3.0
-    if has_install or has_one_command:
+    if has_install:
         eq += 2.0
     if has_usage:
         eq += 2.0
-    if has_docs_link:
+    if ctx["has_docs_link"]:
         eq += 1.0
-    if docs_is_primary_onboarding:
+    # Only possible when the README has no install/usage of its own, so skip the scans otherwise.
+    if not ctx["has_install"] and not has_usage and ctx["docs_is_primary_onboarding"]:
         eq += 0.5  # acknowledge docs-first projects (still README-first scorer)
 
-    if step_lines >= 3:
+    if ctx["step_lines"] >= 3:
         eq += 1.0
-    if code_blocks >= 2:
+    if ctx["code_blocks"] >= 2:
         eq += 0.5
-    if _has(r"(?i)\b(requirements|dependencies|python\s+>=|node\s+>=)\b", t):
+    if ctx["mentions_requirements"]:
         eq += 0.5
 
     # Docs supplement: only count cues the README itself didn't already provide.
     # Each docs signal is capped so it can't dominate the score.
     # We track which signals actually changed eq (not just detected) for traceability.
-    _applied = []
-    if docs_text:
-        if docs_has_install and not (has_install or has_one_command):
+    if ctx.docs_text:
+        if not has_install and ctx["docs_has_install"]:
             eq += 1.0
-            _applied.append("docs_has_install")
-        if docs_has_usage and not has_usage:
+            ctx.docs_applied.append("docs_has_install")
+        if not has_usage and ctx["docs_has_usage"]:
             eq += 1.0
-            _applied.append("docs_has_usage")
-        if docs_step_lines >= 3 and step_lines < 3:
+            ctx.docs_applied.append("docs_has_usage")
+        if ctx["step_lines"] < 3 and ctx["docs_step_lines"] >= 3:
             eq += 0.5
-            _applied.append("docs_step_lines")
+            ctx.docs_applied.append("docs_step_lines")
         # Code blocks are an independent onboarding signal (runnable examples),
         # so they can add a small bump even when the README already has
         # install/usage sections — those sections might lack concrete snippets.
-        if docs_code_blocks >= 2 and code_blocks < 2:
+        if ctx["code_blocks"] < 2 and ctx["docs_code_blocks"] >= 2:
             eq += 0.5
-            _applied.append("docs_code_blocks")
+            ctx.docs_applied.append("docs_code_blocks")
 
     eq = min(10.0, eq)
 
@@ -253,11 +372,92 @@ def evaluate_readme(readme_text: str, *, docs_text: str | None = None) -> EvalRe
         eq_why = "Even if the code works, the onboarding path feels under-specified."
     else:
         eq_why = "It’s runnable with some effort, but the first-success path could be more explicit."
+    return DimensionScore(eq, eq_why)
+
+
+# Fixed order — matches scoring_schema.WEIGHTS and the payload.
+DIMENSIONS: Dict[str, Callable[[SignalContext], DimensionScore]] = {
+    "problem_clarity": _problem_clarity,
+    "novelty_trend_fit": _novelty_trend_fit,
+    "distribution_potential": _distribution_potential,
+    "execution_quality": _execution_quality,
+}
+
+
+def evaluate_readme(
+    readme_text: str,
+    *,
+    docs_text: str | None = None,
+    max_chars: int | None = None,
+    dimensions: Iterable[str] | None = None,
+    doc: Document | None = None,
+    all_signals: bool | None = None,
+) -> EvalResult:
+    """
+    Heuristic v0.3 evaluator (README-first, optional docs supplement).
+
+    What we're trying to measure:
+    - "star-worthiness signals" as they appear to a reader skimming the README
+    - not code quality, not algorithmic difficulty
+
+    This is intentionally conservative:
+    - if a README doesn't *show* evidence, we don't give it credit
 
-    scores = {
-        "problem_clarity": DimensionScore(pc, pc_why),
-        "novelty_trend_fit": DimensionScore(nt, nt_why),
-        "distribution_potential": DimensionScore(dp, dp_why),
-        "execution_quality": DimensionScore(eq, eq_why),
-    }
-    return EvalResult(scores=scores, signals=signals, docs_signals_applied=_applied)
+    docs_text: when --follow-docs is used, the fetched docs page text.
+    Signals from docs are tracked separately (docs_* prefix) for traceability.
+    Only execution_quality uses docs evidence — the other dimensions stay
+    README-only, since they measure first-screen impression.
+
+    max_chars: when set and the README is longer, only the sections the
+    scored dimensions read (intro, install, usage, examples, demo) are
+    scanned — see sectioniser.select_sections. Shorter READMEs are scanned as-is.
+
+    dimensions: score only these (default: all four). Signals are computed
+    lazily, so a run only pays for what its rules read.
+
+    all_signals: report every public signal (forcing the ones the rules
+    skipped) instead of only those computed. Defaults to True for full runs,
+    whose payloads promise the stable signal set; callers that only use
+    scores (history, LLM fallback) pass False and keep the short-circuits.
+
+    doc: the README already parsed with markdown_doc.parse_markdown (e.g.
+    for extract_docs_url), so it isn't parsed twice. With max_chars it also
+    drives the section selection; only the (shorter) selection is parsed again.
+    """
+    if dimensions is None:
+        wanted = list(DIMENSIONS)
+    else:
+        dims = set(dimensions)
+        wanted = [d for d in DIMENSIONS if d in dims]
+        unknown = dims - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(sorted(unknown))}")
+
+    t = readme_text
+    if max_chars is not None and len(t) > max_chars:
+        from sectioniser import select_sections
+
+        # Spend the budget only on the sections the scored dimensions read.
+        t = select_sections(
+            t, dimensions=None if dimensions is None else wanted, max_chars=max_chars, doc=doc
+        ).text
+
+    # A pre-parsed doc only describes the untrimmed README.
+    ctx = SignalContext(t, docs_text, doc=doc if t is readme_text else None)
+    scores = {dim: DIMENSIONS[dim](ctx) for dim in wanted}
+
+    if all_signals is None:
+        all_signals = dimensions is None
+    if all_signals:
+        signals = {name: ctx[name] for name, sig in SIGNALS.items() if sig.public}
+    else:
+        signals = {
+            name: value for name, value in ctx.values.items() if SIGNALS[name].public
+        }
+
+    return EvalResult(
+        scores=scores,
+        signals=signals,
+        docs_signals_applied=ctx.docs_applied,
+        signal_cost=ctx.cost,
+    )
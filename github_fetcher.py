@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import re
 import urllib.error
-import urllib.request
+import zlib
+from collections import deque
 from dataclasses import dataclass
+from typing import Tuple
+
+from transport import UrllibTransport
 
 
 @dataclass(frozen=True)
@@ -13,22 +17,125 @@ class ReadmeFetchResult:
     filename: str
     text: str
     source_url: str
+    wire_bytes: int = 0  # bytes received (compressed, if the server compressed)
+    decoded_bytes: int = 0  # bytes after content decoding
+
+
+@dataclass(frozen=True)
+class FetchStats:
+    url: str
+    status: int
+    content_encoding: str  # "identity", "gzip" or "deflate"
+    wire_bytes: int
+    decoded_bytes: int
 
 
 README_CANDIDATES = ("README.md", "README.MD", "README.rst", "README.txt", "README")
 
+_DOCS_ANCHOR = re.compile(r"(?i)docs|documentation|getting\s+started")
+_DOCS_PATH = re.compile(r"(?i)^https?://\S+/(?:docs|documentation)\b")
+_DOCS_WORD = re.compile(r"(?i)\b(?:docs|documentation)\b")
 
-def _http_get_text(url: str, timeout: int = 20) -> str:
-    req = urllib.request.Request(
+
+# Swappable so CI and perf runs can record/replay instead of hitting GitHub.
+_transport = UrllibTransport()
+
+
+def get_transport():
+    return _transport
+
+
+def set_transport(transport):
+    """Install a transport (see transport.py). Returns the previous one."""
+    global _transport
+    previous, _transport = _transport, transport
+    return previous
+
+
+# Per-fetch transfer stats, most recent last. Bounded so long batches don't grow it forever.
+TRANSFER_LOG: deque = deque(maxlen=10_000)
+
+# Decompression-bomb guard: no README or docs page we care about is this big.
+MAX_DECODED_BYTES = 16 * 1024 * 1024
+_CHUNK = 64 * 1024
+
+
+def _decode_body(body: bytes, encoding: str, limit: int = MAX_DECODED_BYTES) -> bytes:
+    """
+    Undo Content-Encoding, streaming in fixed-size chunks.
+
+    Why chunked:
+    - the output cap is enforced while inflating, so a 10 KB body that
+      expands to gigabytes fails after `limit` bytes instead of exhausting memory
+    - the transport keeps the raw wire bytes, so record/replay cassettes
+      stay faithful to what the server actually sent; it reads them in
+      chunks under the same cap, so oversized bodies fail before buffering
+
+    "deflate" is supposed to be zlib-wrapped, but some servers send raw
+    deflate; we sniff the zlib header and accept both.
+    """
+    if encoding in ("", "identity"):
+        if len(body) > limit:
+            raise ValueError(f"Response body exceeds {limit} bytes")
+        return body
+    if encoding in ("gzip", "x-gzip"):
+        wbits = 16 + zlib.MAX_WBITS
+    elif encoding == "deflate":
+        is_zlib = len(body) >= 2 and body[0] & 0x0F == 8 and (body[0] << 8 | body[1]) % 31 == 0
+        wbits = zlib.MAX_WBITS if is_zlib else -zlib.MAX_WBITS
+    else:
+        raise ValueError(f"Unsupported Content-Encoding: {encoding!r}")
+
+    d = zlib.decompressobj(wbits)
+    out = bytearray()
+    for i in range(0, len(body), _CHUNK):
+        buf = body[i : i + _CHUNK]
+        while buf:
+            out += d.decompress(buf, limit - len(out) + 1)
+            if len(out) > limit:
+                raise ValueError(f"Decompressed body exceeds {limit} bytes")
+            buf = d.unconsumed_tail
+        if d.eof:
+            break
+    out += d.flush()
+    if len(out) > limit:
+        raise ValueError(f"Decompressed body exceeds {limit} bytes")
+    return bytes(out)
+
+
+def _http_get(url: str, timeout: int = 20) -> Tuple[str, FetchStats]:
+    resp = _transport.get(
         url,
-        headers={
+        {
             "User-Agent": "why-projects-get-stars/0.2 (README fetcher)",
             "Accept": "text/plain, text/markdown, */*",
+            "Accept-Encoding": "gzip, deflate",
         },
+        timeout,
+        MAX_DECODED_BYTES,  # wire cap: a compressed body is never larger than its output
+    )
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(url, resp.status, f"HTTP {resp.status}", hdrs=None, fp=None)
+
+    encoding = ""
+    for key, value in resp.headers.items():
+        if key.lower() == "content-encoding":
+            encoding = value.strip().lower()
+    data = _decode_body(resp.body, encoding, MAX_DECODED_BYTES)
+
+    stats = FetchStats(
+        url=url,
+        status=resp.status,
+        content_encoding=encoding or "identity",
+        wire_bytes=len(resp.body),
+        decoded_bytes=len(data),
     )
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        data = resp.read()
-    return data.decode("utf-8", errors="replace")
+    TRANSFER_LOG.append(stats)
+    return data.decode("utf-8", errors="replace"), stats
+
+
+def _http_get_text(url: str, timeout: int = 20) -> str:
+    return _http_get(url, timeout)[0]
 
 
 def fetch_readme(repo: str, ref: str = "main") -> ReadmeFetchResult:
@@ -51,11 +158,19 @@ def fetch_readme(repo: str, ref: str = "main") -> ReadmeFetchResult:
     for filename in README_CANDIDATES:
         url = f"https://raw.githubusercontent.com/{owner}/{name}/{ref}/{filename}"
         try:
-            text = _http_get_text(url)
+            text, stats = _http_get(url)
             # raw.githubusercontent returns a 404 html page sometimes; guard it.
             if "404: Not Found" in text[:200]:
                 raise urllib.error.HTTPError(url, 404, "Not Found", hdrs=None, fp=None)
-            return ReadmeFetchResult(repo=repo, ref=ref, filename=filename, text=text, source_url=url)
+            return ReadmeFetchResult(
+                repo=repo,
+                ref=ref,
+                filename=filename,
+                text=text,
+                source_url=url,
+                wire_bytes=stats.wire_bytes,
+                decoded_bytes=stats.decoded_bytes,
+            )
         except Exception as e:
             last_err = e
             continue
@@ -63,7 +178,7 @@ def fetch_readme(repo: str, ref: str = "main") -> ReadmeFetchResult:
     raise ValueError(f"README not found for {repo}@{ref}. Last error: {last_err}")
 
 
-def extract_docs_url(readme_text: str) -> str | None:
+def extract_docs_url(readme_text: str, doc=None) -> str | None:
     """
     Find the first docs/documentation URL in a README.
 
@@ -74,31 +189,33 @@ def extract_docs_url(readme_text: str) -> str | None:
 
     Returns the first match or None. Intentionally conservative —
     we'd rather miss a link than follow the wrong one.
+
+    All three strategies read the parsed document model (links and URLs
+    outside code blocks), so the README is scanned once. Pass `doc` if the
+    caller already parsed it.
     """
+    from markdown_doc import parse_markdown
+
+    if doc is None:
+        doc = parse_markdown(readme_text)
+
     # 1) Markdown links with docs-related anchor text
-    md_link = re.search(
-        r"\[(?:[^\]]*(?:docs|documentation|getting\s+started)[^\]]*)\]\((https?://[^\s)]+)\)",
-        readme_text,
-        re.IGNORECASE,
-    )
-    if md_link:
-        return md_link.group(1)
+    for link in doc.links:
+        if link.url.startswith(("http://", "https://")) and _DOCS_ANCHOR.search(link.text):
+            return link.url
 
     # 2) Any URL whose path contains /docs or /documentation
-    path_match = re.search(
-        r"(https?://\S+/(?:docs|documentation)\b\S*)",
-        readme_text,
-        re.IGNORECASE,
-    )
-    if path_match:
-        return path_match.group(1)
-
-    # 3) Bare URL on a line that also mentions docs/documentation
-    for line in readme_text.splitlines():
-        if re.search(r"(?i)\b(?:docs|documentation)\b", line):
-            url_match = re.search(r"(https?://\S+)", line)
-            if url_match:
-                return url_match.group(1)
+    for link in doc.urls:
+        if _DOCS_PATH.search(link.url):
+            return link.url
+
+    # 3) URL on a line that also mentions docs/documentation
+    mentions: dict = {}
+    for link in doc.urls:
+        if link.line not in mentions:
+            mentions[link.line] = _DOCS_WORD.search(doc.lines[link.line]) is not None
+        if mentions[link.line]:
+            return link.url
 
     return None
 
@@ -0,0 +1,223 @@
+"""
+README history scoring: how a repo's score changed as its README evolved.
+
+Works on a local git clone, without checking anything out:
+- one `git log --raw` walk finds every commit touching README_CANDIDATES,
+  with the blob SHA of each README version
+- one long-lived `git cat-file --batch` process streams the blob contents
+- each blob is evaluated once (READMEs get reverted, cherry-picked and
+  merged back a lot), so thousands of commits cost a few hundred evaluations
+"""
+
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+
+from github_fetcher import README_CANDIDATES
+
+_NULL_SHA = "0" * 40
+
+
+@dataclass(frozen=True)
+class HistoryPoint:
+    commit: str
+    timestamp: int  # committer date, unix seconds
+    tags: Tuple[str, ...]
+    readme: str  # which README_CANDIDATES file was scored
+    blob: str
+    overall: float
+    scores: Dict[str, float]
+
+    def as_dict(self) -> dict:
+        return {
+            "commit": self.commit,
+            "timestamp": self.timestamp,
+            "tags": list(self.tags),
+            "readme": self.readme,
+            "blob": self.blob,
+            "overall": self.overall,
+            "scores": self.scores,
+        }
+
+
+def _git(repo_path: str, *args: str) -> str:
+    out = subprocess.run(
+        ["git", "-C", repo_path, *args],
+        check=True,
+        capture_output=True,
+    )
+    return out.stdout.decode("utf-8", errors="replace")
+
+
+def _tags_by_commit(repo_path: str, merged: str | None = None) -> Dict[str, Tuple[int, List[str]]]:
+    """
+    commit SHA -> (committer date, tag names), annotated tags peeled.
+    merged: only tags reachable from this ref.
+    """
+    out = _git(
+        repo_path,
+        "for-each-ref",
+        "--sort=refname",
+        "--format=%(refname:short)%00%(objectname)%00%(*objectname)"
+        "%00%(committerdate:unix)%00%(*committerdate:unix)",
+        *([f"--merged={merged}"] if merged else []),
+        "refs/tags",
+    )
+    tags: Dict[str, Tuple[int, List[str]]] = {}
+    for line in out.splitlines():
+        name, obj, peeled, date, peeled_date = line.split("\0")
+        if not (peeled_date or date):
+            continue  # tag of a tree or blob, not a commit
+        entry = tags.setdefault(peeled or obj, (int(peeled_date or date), []))
+        entry[1].append(name)
+    return tags
+
+
+def readme_commits(repo_path: str, ref: str = "HEAD") -> Iterator[Tuple[str, int, str, str]]:
+    """
+    Yield (commit, timestamp, readme filename, blob SHA), oldest first, for
+    every first-parent commit that touches a README candidate.
+
+    We track the blob of each candidate as we walk, so when several exist
+    the first in README_CANDIDATES order wins — same rule as fetch_readme.
+    """
+    out = _git(
+        repo_path,
+        "log",
+        "--reverse",
+        "--first-parent",
+        "-m",
+        "--raw",
+        "--no-abbrev",
+        "--no-renames",
+        "--format=%x00%H %ct",
+        ref,
+        "--",
+        *README_CANDIDATES,
+    )
+
+    current: Dict[str, str] = {}
+
+    def active(commit: str, ts: int):
+        for name in README_CANDIDATES:
+            if name in current:
+                return commit, ts, name, current[name]
+        return None
+
+    commit, ts = None, 0
+    for line in out.splitlines():
+        if line.startswith("\0"):
+            if commit is not None:
+                point = active(commit, ts)
+                if point:
+                    yield point
+            sha, stamp = line[1:].split()
+            commit, ts = sha, int(stamp)
+        elif line.startswith(":"):
+            meta, path = line.split("\t", 1)
+            new_sha, status = meta.split()[3], meta.split()[4]
+            if status.startswith("D") or new_sha == _NULL_SHA:
+                current.pop(path, None)
+            else:
+                current[path] = new_sha
+    if commit is not None:
+        point = active(commit, ts)
+        if point:
+            yield point
+
+
+def readme_tags(
+    repo_path: str, ref: str = "HEAD"
+) -> Iterator[Tuple[str, int, str, str, Tuple[str, ...]]]:
+    """
+    Yield (commit, timestamp, readme filename, blob SHA, tag names) per
+    commit tagged in `ref`'s history, oldest first. One
+    `cat-file --batch-check` resolves them all.
+    """
+    tags = _tags_by_commit(repo_path, merged=ref)
+    commits = sorted(tags, key=lambda c: tags[c][0])
+    queries = [f"{c}:{name}" for c in commits for name in README_CANDIDATES]
+    if not queries:
+        return
+    out = subprocess.run(
+        ["git", "-C", repo_path, "cat-file", "--batch-check"],
+        input="\n".join(queries).encode("utf-8") + b"\n",
+        check=True,
+        capture_output=True,
+    ).stdout.decode("utf-8")
+
+    results = out.splitlines()
+    per_commit = len(README_CANDIDATES)
+    for i, c in enumerate(commits):
+        for j, name in enumerate(README_CANDIDATES):
+            parts = results[i * per_commit + j].split()
+            if len(parts) == 3 and parts[1] == "blob":
+                ts, names = tags[c]
+                yield c, ts, name, parts[0], tuple(names)
+                break
+
+
+class BlobReader:
+    """One `git cat-file --batch` process; blobs are requested and read one at a time."""
+
+    def __init__(self, repo_path: str) -> None:
+        self._proc = subprocess.Popen(
+            ["git", "-C", repo_path, "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, sha: str) -> bytes:
+        self._proc.stdin.write(sha.encode("ascii") + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().decode("ascii").split()
+        if len(header) != 3:
+            raise ValueError(f"git cat-file: object not found: {sha}")
+        data = self._proc.stdout.read(int(header[2]))
+        self._proc.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self) -> None:
+        if self._proc.stdin:
+            self._proc.stdin.close()
+        if self._proc.stdout:
+            self._proc.stdout.close()
+        self._proc.wait()
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def score_history(
+    repo_path: str, *, ref: str = "HEAD", tags_only: bool = False
+) -> List[HistoryPoint]:
+    """Time series of README scores for a local clone (oldest first)."""
+    from evaluator import evaluate_readme
+    from scoring_schema import calculate_overall_score
+
+    if tags_only:
+        rows = list(readme_tags(repo_path, ref))
+    else:
+        tag_names = {c: tuple(names) for c, (_, names) in _tags_by_commit(repo_path).items()}
+        rows = [
+            (c, ts, name, blob, tag_names.get(c, ()))
+            for c, ts, name, blob in readme_commits(repo_path, ref)
+        ]
+
+    cache: Dict[str, Tuple[float, Dict[str, float]]] = {}
+    points: List[HistoryPoint] = []
+    with BlobReader(repo_path) as reader:
+        for commit, ts, name, blob, tags in rows:
+            if blob not in cache:
+                text = reader.read(blob).decode("utf-8", errors="replace")
+                ev = evaluate_readme(text, all_signals=False)
+                numeric = {k: v.score for k, v in ev.scores.items()}
+                cache[blob] = (calculate_overall_score(numeric), numeric)
+            overall, numeric = cache[blob]
+            points.append(HistoryPoint(commit, ts, tags, name, blob, overall, numeric))
+    return points
@@ -0,0 +1,365 @@
+"""
+Optional LLM scoring backend.
+
+Wires the two templates in prompts.py into a pipeline:
+1. PROMPT_README_TO_SIGNALS  — README text -> evidence bullets per dimension
+2. PROMPT_SIGNALS_TO_SCORES  — evidence bullets -> 0–10 score + reason per dimension
+
+Design goals:
+- stdlib-only (urllib + threads), same as the rest of the project
+- the client is pluggable, so tests can point it at a local stub server
+- never fail a run: timeouts, bad JSON or out-of-range scores fall back to
+  the heuristic evaluate_readme()
+- cost/latency counters, so we can see where the LLM path is worth paying for
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, TypeVar
+
+from evaluator import DimensionScore, EvalResult, evaluate_readme
+from prompts import PROMPT_README_TO_SIGNALS, PROMPT_SIGNALS_TO_SCORES
+from scoring_schema import WEIGHTS, validate_scores
+from sectioniser import build_section_tree, select_sections, where_at
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class LLMReply:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class HttpLLMClient:
+    """
+    Minimal JSON-over-HTTP completion client.
+
+    Request:  POST {"model": ..., "prompt": ..., "max_tokens": ...}
+    Response: {"text": "...", "usage": {"prompt_tokens": n, "completion_tokens": n}}
+
+    Anything that speaks this shape works — a hosted gateway or a local stub.
+    Any object with a compatible complete() method can replace this class.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        model: str | None = None,
+        api_key: str | None = None,
+        max_tokens: int = 800,
+    ) -> None:
+        self.endpoint = endpoint
+        self.model = model
+        self.api_key = api_key
+        self.max_tokens = max_tokens
+
+    def complete(self, prompt: str, *, timeout: float) -> LLMReply:
+        body = json.dumps(
+            {"model": self.model, "prompt": prompt, "max_tokens": self.max_tokens}
+        ).encode("utf-8")
+        headers = {
+            "User-Agent": "why-projects-get-stars/0.3 (LLM scorer)",
+            "Content-Type": "application/json",
+        }
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        req = urllib.request.Request(self.endpoint, data=body, headers=headers, method="POST")
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            data = json.loads(resp.read().decode("utf-8"))
+
+        usage = data.get("usage") or {}
+        return LLMReply(
+            text=str(data["text"]),
+            prompt_tokens=int(usage.get("prompt_tokens", 0)),
+            completion_tokens=int(usage.get("completion_tokens", 0)),
+        )
+
+
+class ResponseCache:
+    """
+    Prompt-hash -> completion text cache.
+
+    Keys are sha256(template + input), so the same README scored twice (or a
+    README shared by many forks) costs one request. Optionally persisted as a
+    single JSON file so reruns are free.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, str] = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+
+    @staticmethod
+    def key(template: str, text: str) -> str:
+        h = hashlib.sha256()
+        h.update(template.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            return self._data.get(key)
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            snapshot = dict(self._data)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, sort_keys=True)
+
+
+@dataclass
+class LLMStats:
+    requests: int = 0
+    cache_hits: int = 0
+    fallbacks: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    latency_s_total: float = 0.0
+    latency_s_max: float = 0.0
+
+    def as_dict(self) -> dict:
+        avg = self.latency_s_total / self.requests if self.requests else 0.0
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "fallbacks": self.fallbacks,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_s_avg": round(avg, 4),
+            "latency_s_max": round(self.latency_s_max, 4),
+        }
+
+
+@dataclass(frozen=True)
+class LLMScoreResult:
+    scores: Dict[str, DimensionScore]
+    backend: str  # "llm" or "heuristic" (fallback)
+    error: str | None = None  # why we fell back, if we did
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 chars per token is close enough for budgeting; we never bill on it.
+    return max(1, len(text) // 4)
+
+
+def _parse_json_object(text: str) -> dict:
+    """
+    Parse the first JSON object in a completion.
+
+    Models like to wrap JSON in prose or ``` fences; we only trust the
+    outermost {...} span and fail loudly if it doesn't parse.
+    """
+    start = text.find("{")
+    end = text.rfind("}")
+    if start < 0 or end <= start:
+        raise ValueError("LLM reply contains no JSON object")
+    obj = json.loads(text[start : end + 1])
+    if not isinstance(obj, dict):
+        raise ValueError("LLM reply JSON is not an object")
+    return obj
+
+
+def fill_where(evidence: dict, readme_text: str) -> None:
+    """
+    Fill each bullet's `where` from the section map, by locating its quote.
+
+    Models are sloppy about `where`; the quote is verbatim README text, so we
+    can just look it up. Bullets whose quote isn't found keep what they had.
+    """
+    root, data = build_section_tree(readme_text)
+    for bullets in evidence.values():
+        if not isinstance(bullets, list):
+            continue
+        for bullet in bullets:
+            if not isinstance(bullet, dict) or not bullet.get("quote"):
+                continue
+            offset = data.find(str(bullet["quote"]).encode("utf-8"))
+            if offset >= 0:
+                where = where_at(root, offset)
+                if where:
+                    bullet["where"] = where
+
+
+class LLMScorer:
+    """
+    Batched, cached LLM scoring with heuristic fallback.
+
+    price_per_1k_*: USD per 1k tokens, used only for the cost counter.
+    token_budget: upper bound on estimated prompt tokens in flight per batch.
+    max_chars: when set, only the scoring-relevant README sections (within
+    this budget) are sent, labelled with their `where` (see sectioniser).
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        cache: ResponseCache | None = None,
+        timeout: float = 30.0,
+        max_workers: int = 4,
+        token_budget: int = 32_000,
+        price_per_1k_prompt: float = 0.0,
+        price_per_1k_completion: float = 0.0,
+        max_chars: int | None = None,
+    ) -> None:
+        self.client = client
+        self.cache = cache if cache is not None else ResponseCache()
+        self.timeout = timeout
+        self.max_workers = max(1, max_workers)
+        self.token_budget = max(1, token_budget)
+        self.price_per_1k_prompt = price_per_1k_prompt
+        self.price_per_1k_completion = price_per_1k_completion
+        self.max_chars = max_chars
+        self.stats = LLMStats()
+        self._lock = threading.Lock()
+
+    # --- single call (cached, counted) ---
+
+    def _call(self, template: str, payload: str, check: Callable[[str], T]) -> T:
+        """
+        One stage: cached reply or a fresh request, passed through `check`.
+
+        Only replies that pass `check` are cached, so a malformed or
+        out-of-range answer is retried next run instead of replayed forever.
+        """
+        key = ResponseCache.key(template, payload)
+        cached = self.cache.get(key)
+        if cached is not None:
+            with self._lock:
+                self.stats.cache_hits += 1
+            return check(cached)
+
+        prompt = f"{template.strip()}\n\n---\n{payload}"
+        t0 = time.perf_counter()
+        reply = self.client.complete(prompt, timeout=self.timeout)
+        elapsed = time.perf_counter() - t0
+
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.prompt_tokens += reply.prompt_tokens
+            self.stats.completion_tokens += reply.completion_tokens
+            self.stats.cost_usd += (
+                reply.prompt_tokens * self.price_per_1k_prompt
+                + reply.completion_tokens * self.price_per_1k_completion
+            ) / 1000.0
+            self.stats.latency_s_total += elapsed
+            self.stats.latency_s_max = max(self.stats.latency_s_max, elapsed)
+
+        value = check(reply.text)
+        self.cache.put(key, reply.text)
+        return value
+
+    # --- one README ---
+
+    def _readme_payload(self, readme_text: str) -> str:
+        if self.max_chars is None or len(readme_text) <= self.max_chars:
+            return f"README:\n{readme_text}"
+        selection = select_sections(readme_text, max_chars=self.max_chars)
+        return f"README (selected sections):\n{selection.labelled_text()}"
+
+    @staticmethod
+    def _check_scores(text: str) -> Dict[str, DimensionScore]:
+        scored = _parse_json_object(text)
+        numeric: Dict[str, float] = {}
+        reasons: Dict[str, str] = {}
+        for dim in WEIGHTS:
+            entry = scored.get(dim)
+            if not isinstance(entry, dict):
+                raise ValueError(f"LLM reply missing dimension: {dim}")
+            numeric[dim] = float(entry.get("score"))
+            reasons[dim] = str(entry.get("reason", "")).strip()
+
+        # Same contract as the heuristic path: no clamping, fail fast.
+        validate_scores(numeric)
+        return {dim: DimensionScore(numeric[dim], reasons[dim]) for dim in WEIGHTS}
+
+    def _score_llm(self, readme_text: str) -> Dict[str, DimensionScore]:
+        evidence = self._call(
+            PROMPT_README_TO_SIGNALS, self._readme_payload(readme_text), _parse_json_object
+        )
+        fill_where(evidence, readme_text)
+        evidence_json = json.dumps(evidence, ensure_ascii=False, sort_keys=True)
+        return self._call(PROMPT_SIGNALS_TO_SCORES, f"Signals:\n{evidence_json}", self._check_scores)
+
+    def score(self, readme_text: str, *, fallback: EvalResult | None = None) -> LLMScoreResult:
+        """
+        LLM scores, or the heuristic scores if any stage fails.
+
+        fallback: the caller's own heuristic result (e.g. with docs_text or
+        max_chars applied), so a failed LLM call reports exactly the scores
+        the non-LLM path would. Without it the bare README is evaluated.
+        """
+        try:
+            return LLMScoreResult(scores=self._score_llm(readme_text), backend="llm")
+        except Exception as e:
+            with self._lock:
+                self.stats.fallbacks += 1
+            ev = fallback if fallback is not None else evaluate_readme(readme_text, all_signals=False)
+            return LLMScoreResult(
+                scores=ev.scores,
+                backend="heuristic",
+                error=f"{type(e).__name__}: {e}",
+            )
+
+    # --- many READMEs ---
+
+    def plan_batches(self, readme_texts: List[str]) -> List[List[int]]:
+        """
+        Group README indices so each batch stays under token_budget.
+
+        A README larger than the budget on its own still gets a batch
+        (of one) — we'd rather send it alone than drop it.
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for i, text in enumerate(readme_texts):
+            if self.max_chars is not None:
+                text = text[: self.max_chars]
+            cost = estimate_tokens(PROMPT_README_TO_SIGNALS) + estimate_tokens(text)
+            if current and used + cost > self.token_budget:
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def score_many(
+        self, readme_texts: List[str], *, fallbacks: List[EvalResult | None] | None = None
+    ) -> List[LLMScoreResult]:
+        """Score READMEs concurrently, batch by batch. Output order matches input."""
+        results: List[LLMScoreResult | None] = [None] * len(readme_texts)
+        fallbacks = fallbacks if fallbacks is not None else [None] * len(readme_texts)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for batch in self.plan_batches(readme_texts):
+                futures = {
+                    i: pool.submit(self.score, readme_texts[i], fallback=fallbacks[i]) for i in batch
+                }
+                for i, fut in futures.items():
+                    results[i] = fut.result()
+        return results  # type: ignore[return-value]
@@ -4,12 +4,121 @@ why-projects-get-stars — entry point
 Status: v0.3 (README-first heuristic scorer + optional docs-follow mode)
 
 CLI: python main.py score --repo owner/name [--ref main] [--format text|json]
+     python main.py batch --repos repos.txt [--out results.jsonl]
+     python main.py batch --repos repos.txt --shard 0/4 --out shard0.jsonl
+     python main.py merge --results shard*.jsonl --out results.jsonl
+     python main.py history --path ./clone [--tags]
+     python main.py reference --results results.jsonl --out reference.json
+     python main.py snapshot --results results.jsonl --out results.snap
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
+
+def _dimension_list(value: str) -> list[str]:
+    from evaluator import DIMENSIONS
+
+    dims = [d.strip() for d in value.split(",") if d.strip()]
+    unknown = [d for d in dims if d not in DIMENSIONS]
+    if not dims or unknown:
+        raise argparse.ArgumentTypeError(
+            f"expected a comma-separated subset of: {', '.join(DIMENSIONS)}"
+        )
+    return dims
+
+
+def _add_transport_args(p: argparse.ArgumentParser) -> None:
+    group = p.add_mutually_exclusive_group()
+    group.add_argument(
+        "--record",
+        metavar="CASSETTE",
+        default=None,
+        help="Record every HTTP response to this cassette file.",
+    )
+    group.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        default=None,
+        help="Serve HTTP responses from this cassette instead of the network.",
+    )
+    p.add_argument(
+        "--replay-latency",
+        action="store_true",
+        default=False,
+        help="With --replay, sleep for each response's recorded latency.",
+    )
+
+
+def _add_llm_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--llm-endpoint",
+        default=None,
+        help="Score with an LLM behind this JSON endpoint (falls back to heuristics on error).",
+    )
+    p.add_argument(
+        "--llm-model",
+        default=None,
+        help="Model name passed through to the LLM endpoint.",
+    )
+    p.add_argument(
+        "--llm-timeout",
+        type=float,
+        default=30.0,
+        help="Per-request LLM timeout in seconds (default: 30).",
+    )
+    p.add_argument(
+        "--llm-cache",
+        default=None,
+        help="JSON file used to cache LLM responses across runs.",
+    )
+    p.add_argument(
+        "--llm-price-prompt",
+        type=float,
+        default=0.0,
+        help="USD per 1k prompt tokens, for the cost in llm_stats (default: 0).",
+    )
+    p.add_argument(
+        "--llm-price-completion",
+        type=float,
+        default=0.0,
+        help="USD per 1k completion tokens, for the cost in llm_stats (default: 0).",
+    )
+
+
+def _build_llm_scorer(args: argparse.Namespace):
+    """(LLMScorer, ResponseCache) from the --llm-* flags; call cache.save() when done."""
+    from llm_scorer import HttpLLMClient, LLMScorer, ResponseCache
+
+    client = HttpLLMClient(
+        args.llm_endpoint,
+        model=args.llm_model,
+        api_key=os.environ.get("WPGS_LLM_API_KEY"),
+    )
+    cache = ResponseCache(args.llm_cache)
+    scorer = LLMScorer(
+        client,
+        cache=cache,
+        timeout=args.llm_timeout,
+        price_per_1k_prompt=args.llm_price_prompt,
+        price_per_1k_completion=args.llm_price_completion,
+        max_chars=args.max_chars,
+    )
+    return scorer, cache
+
+
+def _install_transport(args: argparse.Namespace) -> None:
+    from github_fetcher import set_transport
+    from transport import RecordingTransport, ReplayTransport
+
+    if getattr(args, "record", None):
+        set_transport(RecordingTransport(args.record))
+    elif getattr(args, "replay", None):
+        set_transport(ReplayTransport(args.replay, latency=args.replay_latency))
+
 
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -45,6 +154,212 @@ def _build_parser() -> argparse.ArgumentParser:
         default=False,
         help="Follow the first docs link in the README and use it as supplemental evidence.",
     )
+    score.add_argument(
+        "--max-chars",
+        type=int,
+        default=None,
+        help="Only score the relevant README sections (intro/install/usage/demo) within this budget.",
+    )
+    score.add_argument(
+        "--dimensions",
+        type=_dimension_list,
+        default=None,
+        help="Comma-separated dimensions to score (default: all four; overall needs all four).",
+    )
+    score.add_argument(
+        "--reference",
+        default=None,
+        help="Reference sketch file (see `reference`); adds percentile ranks to the output.",
+    )
+    _add_llm_args(score)
+    _add_transport_args(score)
+
+    batch = sub.add_parser(
+        "batch",
+        help="Score many repos (one owner/name per line) to JSONL, deduping READMEs.",
+    )
+    batch.add_argument(
+        "--repos",
+        required=True,
+        help="Text file with one owner/name per line (# comments allowed).",
+    )
+    batch.add_argument(
+        "--ref",
+        default="main",
+        help='Branch/tag/sha to read from (default: "main").',
+    )
+    batch.add_argument(
+        "--out",
+        default=None,
+        help="Write JSONL here instead of stdout.",
+    )
+    batch.add_argument(
+        "--shard",
+        default=None,
+        help='Only score this node\'s share of the repo list, as "i/N" (0-based).',
+    )
+    batch.add_argument(
+        "--summary-out",
+        default=None,
+        help="Also write the batch summary (JSON) here.",
+    )
+    batch.add_argument(
+        "--reference-out",
+        default=None,
+        help="Also write a percentile reference sketch built from this run.",
+    )
+    batch.add_argument(
+        "--snapshot-out",
+        default=None,
+        help="Also write a binary snapshot (see `snapshot`) of the scored records.",
+    )
+    batch.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent README fetches (default: 4).",
+    )
+    batch.add_argument(
+        "--max-chars",
+        type=int,
+        default=None,
+        help="Only score the relevant README sections within this budget.",
+    )
+    batch.add_argument(
+        "--dimensions",
+        type=_dimension_list,
+        default=None,
+        help="Comma-separated dimensions to score (default: all four).",
+    )
+    batch.add_argument(
+        "--near-threshold",
+        type=float,
+        default=0.8,
+        help="Estimated Jaccard similarity for near-duplicate clusters (default: 0.8).",
+    )
+    batch.add_argument(
+        "--near-dedupe",
+        action="store_true",
+        default=False,
+        help="Also cluster near-duplicate READMEs (MinHash/LSH); implied by --skip-near-duplicates.",
+    )
+    batch.add_argument(
+        "--skip-near-duplicates",
+        action="store_true",
+        default=False,
+        help="Reuse the cluster representative's scores for near-duplicate READMEs.",
+    )
+    _add_llm_args(batch)
+    _add_transport_args(batch)
+
+    merge = sub.add_parser(
+        "merge",
+        help="Combine sharded batch outputs into one deduplicated result set.",
+    )
+    merge.add_argument(
+        "--results",
+        nargs="+",
+        required=True,
+        help="Batch JSONL files, one per shard.",
+    )
+    merge.add_argument(
+        "--out",
+        required=True,
+        help="Merged JSONL output.",
+    )
+    merge.add_argument(
+        "--summaries",
+        nargs="*",
+        default=[],
+        help="Per-shard summary files (batch --summary-out).",
+    )
+    merge.add_argument(
+        "--summary-out",
+        default=None,
+        help="Where to write the merged summary.",
+    )
+    merge.add_argument(
+        "--references",
+        nargs="*",
+        default=[],
+        help="Per-shard reference sketches (batch --reference-out).",
+    )
+    merge.add_argument(
+        "--reference-out",
+        default=None,
+        help="Where to write the merged reference sketch.",
+    )
+
+    history = sub.add_parser(
+        "history",
+        help="Score every README version in a local git clone (time series).",
+    )
+    history.add_argument(
+        "--path",
+        required=True,
+        help="Path to a local git clone.",
+    )
+    history.add_argument(
+        "--ref",
+        default="HEAD",
+        help='Walk first-parent history from this ref; with --tags, only tags reachable from it (default: "HEAD").',
+    )
+    history.add_argument(
+        "--tags",
+        action="store_true",
+        default=False,
+        help="Score tagged commits only, instead of every commit touching the README.",
+    )
+    history.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help='Output format (default: "text").',
+    )
+
+    reference = sub.add_parser(
+        "reference",
+        help="Build or merge a percentile reference sketch from batch results.",
+    )
+    reference.add_argument(
+        "--results",
+        nargs="*",
+        default=[],
+        help="Batch JSONL files to add to the reference.",
+    )
+    reference.add_argument(
+        "--merge",
+        nargs="*",
+        default=[],
+        help="Existing reference sketch files to merge in (e.g. one per shard).",
+    )
+    reference.add_argument(
+        "--out",
+        required=True,
+        help="Where to write the merged reference sketch.",
+    )
+    reference.add_argument(
+        "--k",
+        type=int,
+        default=200,
+        help="Sketch accuracy parameter (default: 200, ~1%% rank error).",
+    )
+
+    snapshot = sub.add_parser(
+        "snapshot",
+        help="Convert batch results to a memory-mappable binary snapshot for fast analysis.",
+    )
+    snapshot.add_argument(
+        "--results",
+        nargs="+",
+        required=True,
+        help="Batch JSONL files to include.",
+    )
+    snapshot.add_argument(
+        "--out",
+        required=True,
+        help="Where to write the snapshot.",
+    )
 
     return parser
 
@@ -52,11 +367,13 @@ def _build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> None:
     parser = _build_parser()
     args = parser.parse_args(argv)
+    _install_transport(args)
 
     if args.command == "score":
         from github_fetcher import fetch_readme, extract_docs_url, fetch_docs_page
         from evaluator import evaluate_readme
-        from scoring_schema import calculate_overall_score
+        from batch import DIM_ORDER, build_payload
+        from markdown_doc import parse_markdown
 
         res = fetch_readme(args.repo, args.ref)
 
@@ -65,44 +382,61 @@ def main(argv: list[str] | None = None) -> None:
         docs_fetch_ok = 0
         docs_text = None
 
+        # Parse once; docs-link extraction and the evaluator share the model.
+        doc = parse_markdown(res.text)
+
         if args.follow_docs:
-            docs_followed_url = extract_docs_url(res.text)
+            docs_followed_url = extract_docs_url(res.text, doc=doc)
             if docs_followed_url:
                 docs_text = fetch_docs_page(docs_followed_url)
                 docs_fetch_ok = 1 if docs_text else 0
 
-        ev = evaluate_readme(res.text, docs_text=docs_text)
-
-        numeric_scores = {k: v.score for k, v in ev.scores.items()}
-        overall = calculate_overall_score(numeric_scores)
-
-        # Fixed dimension order — must stay stable across versions.
-        _DIM_ORDER = [
-            "problem_clarity",
-            "novelty_trend_fit",
-            "distribution_potential",
-            "execution_quality",
-        ]
-
-        scores_ordered = {
-            dim: {"score": ev.scores[dim].score, "why": ev.scores[dim].why}
-            for dim in _DIM_ORDER
-        }
-
-        # Top-level key order: version, repo, readme, source, overall, scores, signals,
-        # then docs debug fields.
-        payload = {
-            "version": "0.3.0",
-            "repo": f"{args.repo}@{args.ref}",
-            "readme": res.filename,
-            "source": res.source_url,
-            "overall": overall,
-            "scores": scores_ordered,
-            "signals": dict(sorted(ev.signals.items())),
-            "docs_followed_url": docs_followed_url,
-            "docs_fetch_ok": docs_fetch_ok,
-            "docs_signals_used": ev.docs_signals_applied,
-        }
+        ev = evaluate_readme(
+            res.text,
+            docs_text=docs_text,
+            max_chars=args.max_chars,
+            dimensions=args.dimensions,
+            doc=doc,
+        )
+        dim_scores = ev.scores
+
+        # --llm-endpoint: replace the dimension scores, keep heuristic signals for debug.
+        llm_result = None
+        llm_scorer = None
+        if args.llm_endpoint:
+            llm_scorer, cache = _build_llm_scorer(args)
+            llm_result = llm_scorer.score(res.text, fallback=ev)
+            cache.save()
+            if llm_result.backend == "llm":
+                dim_scores = {
+                    dim: ds
+                    for dim, ds in llm_result.scores.items()
+                    if args.dimensions is None or dim in args.dimensions
+                }
+            # On fallback dim_scores stays ev.scores: same docs/max_chars
+            # evidence as docs_signals_used in the payload.
+
+        payload = build_payload(
+            args.repo,
+            args.ref,
+            res,
+            ev,
+            dim_scores=dim_scores,
+            docs_followed_url=docs_followed_url,
+            docs_fetch_ok=docs_fetch_ok,
+        )
+        overall = payload["overall"]
+
+        percentile_ranks = None
+        if args.reference:
+            from percentiles import ReferenceSketches
+
+            percentile_ranks = ReferenceSketches.load(args.reference).percentiles(payload)
+            payload["percentiles"] = percentile_ranks
+        if llm_result is not None:
+            payload["scorer"] = llm_result.backend
+            payload["scorer_error"] = llm_result.error
+            payload["llm_stats"] = llm_scorer.stats.as_dict()
 
         if args.format == "json":
             print(json.dumps(payload, ensure_ascii=False, indent=2))
@@ -113,16 +447,160 @@ def main(argv: list[str] | None = None) -> None:
         print(f"README: {res.filename}")
         print(f"Source: {res.source_url}")
         print()
-        print(f"Overall (0-10): {overall}")
+        print(f"Overall (0-10): {overall if overall is not None else 'n/a (partial --dimensions)'}")
+        if percentile_ranks is not None:
+            print(f"Percentile vs reference: {percentile_ranks.get('overall')}")
         print()
 
-        for dim in _DIM_ORDER:
-            ds = ev.scores[dim]
+        for dim in DIM_ORDER:
+            if dim not in dim_scores:
+                continue
+            ds = dim_scores[dim]
             print(f"- {dim}: {ds.score}/10")
             print(f"  why: {ds.why}")
+            if percentile_ranks is not None:
+                print(f"  percentile: {percentile_ranks.get(dim)}")
 
         print()
         print("Debug signals:", dict(sorted(ev.signals.items())))
+        if llm_result is not None:
+            print(f"Scorer: {llm_result.backend}", f"({llm_result.error})" if llm_result.error else "")
+            print("LLM stats:", llm_scorer.stats.as_dict())
+        return
+
+    if args.command == "batch":
+        from batch import read_repo_list, run_batch
+
+        repos = read_repo_list(args.repos)
+        if args.shard:
+            from sharding import parse_shard, select_shard
+
+            try:
+                index, count = parse_shard(args.shard)
+            except ValueError as e:
+                parser.error(str(e))
+            repos = select_shard(repos, index, count)
+
+        llm_scorer = cache = None
+        if args.llm_endpoint:
+            llm_scorer, cache = _build_llm_scorer(args)
+
+        records, summary = run_batch(
+            repos,
+            ref=args.ref,
+            workers=args.workers,
+            near_dedupe=args.near_dedupe,
+            skip_near_duplicates=args.skip_near_duplicates,
+            near_threshold=args.near_threshold,
+            max_chars=args.max_chars,
+            dimensions=args.dimensions,
+            llm_scorer=llm_scorer,
+        )
+        if cache is not None:
+            cache.save()
+
+        out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+        try:
+            for rec in records:
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        finally:
+            if args.out:
+                out.close()
+
+        summary.shard = args.shard or ""
+        if args.summary_out:
+            summary.save(args.summary_out)
+        if args.reference_out:
+            from percentiles import ReferenceSketches
+
+            ref = ReferenceSketches()
+            for rec in records:
+                if "error" not in rec:
+                    ref.add_payload(rec)
+            ref.save(args.reference_out)
+        if args.snapshot_out:
+            from snapshot import write_snapshot
+
+            write_snapshot(args.snapshot_out, records)
+
+        print("Batch summary:", json.dumps(summary.as_dict()), file=sys.stderr)
+        if llm_scorer is not None:
+            print("LLM stats:", json.dumps(llm_scorer.stats.as_dict()), file=sys.stderr)
+        return
+
+    if args.command == "merge":
+        from batch import merge_results, merge_summaries
+
+        records = merge_results(args.results)
+        with open(args.out, "w", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+        summaries = []
+        for path in args.summaries:
+            with open(path, "r", encoding="utf-8") as f:
+                summaries.append(json.load(f))
+        merged_summary = merge_summaries(summaries, records)
+        if args.summary_out:
+            with open(args.summary_out, "w", encoding="utf-8") as f:
+                json.dump(merged_summary, f, indent=2)
+
+        if args.references:
+            from percentiles import ReferenceSketches
+
+            ref = ReferenceSketches.load(args.references[0])
+            for path in args.references[1:]:
+                ref.merge(ReferenceSketches.load(path))
+            if args.reference_out:
+                ref.save(args.reference_out)
+
+        print("Merge summary:", json.dumps(merged_summary), file=sys.stderr)
+        return
+
+    if args.command == "history":
+        from datetime import datetime, timezone
+
+        from batch import DIM_ORDER
+        from history import score_history
+
+        points = score_history(args.path, ref=args.ref, tags_only=args.tags)
+
+        if args.format == "json":
+            payload = {
+                "path": args.path,
+                "ref": args.ref,
+                "points": [p.as_dict() for p in points],
+            }
+            print(json.dumps(payload, ensure_ascii=False, indent=2))
+            return
+
+        print(f"{'date':<10}  {'commit':<8}  overall  " + "  ".join(d[:4] for d in DIM_ORDER) + "  readme")
+        for p in points:
+            date = datetime.fromtimestamp(p.timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+            dims = "  ".join(f"{p.scores[d]:>4}" for d in DIM_ORDER)
+            tags = f"  ({', '.join(p.tags)})" if p.tags else ""
+            print(f"{date:<10}  {p.commit[:8]}  {p.overall:>7}  {dims}  {p.readme}{tags}")
+        return
+
+    if args.command == "reference":
+        from percentiles import ReferenceSketches, iter_result_payloads
+
+        ref = ReferenceSketches(k=args.k)
+        for payload in iter_result_payloads(args.results):
+            ref.add_payload(payload)
+        for path in args.merge:
+            ref.merge(ReferenceSketches.load(path))
+        ref.save(args.out)
+
+        print(f"Reference: {ref.n} repos -> {args.out}", file=sys.stderr)
+        return
+
+    if args.command == "snapshot":
+        from percentiles import iter_result_payloads
+        from snapshot import write_snapshot
+
+        n = write_snapshot(args.out, iter_result_payloads(args.results))
+        print(f"Snapshot: {n} repos -> {args.out}", file=sys.stderr)
         return
 
 
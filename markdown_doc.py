@@ -0,0 +1,328 @@
+"""
+Single-pass Markdown document model.
+
+Why this exists:
+- the evaluator used to rescan the whole README once per cue (images,
+  badges, fences, bullets, steps), and extract_docs_url did up to three
+  more full-text scans plus a per-line loop
+- counting ``` and dividing by two miscounts unbalanced fences, and
+  anything that looks like a heading, list or link *inside* a code block
+  was counted as if it were prose
+
+parse_markdown() builds the model once per README:
+- one anchored scan finds every block token (fence, heading, list item)
+  in order, pairing fences the way CommonMark does (closing fence = same
+  char, at least as long, no info string; an unclosed fence runs to the
+  end) and ignoring everything else inside them; a fence may sit inside a
+  list item (indented to the item's content) or behind a "> " quote marker
+- one scan each for links, images and bare URLs, dropping any that fall
+  inside a code range (bisect)
+The regex engine does the walking; Python only runs per token, never per
+line. No pattern can rescan past the start of the next token, so even
+adversarial input (a line of thousands of unclosed links) stays linear.
+
+It is deliberately not a full CommonMark parser: no nested block quotes,
+reference-style links or HTML blocks. Good enough for "what does the
+README show", which is all we score.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+# Every block-level token starts a line, so one alternation finds them all
+# in a single scan: fence, ATX heading, setext underline, list item. It runs
+# over "\n" + text: a literal lead lets the regex engine jump from newline
+# to newline instead of trying `^` at every character, and the lookahead
+# drops prose lines on their first character. Each alternative ends in a
+# different group, so m.lastgroup says which one matched.
+_BLOCK = re.compile(
+    r"""\n(?=[ \t>]*[`~\#=\-*\u2022\dSs])(?:
+      (?P<quote>[ ]{0,3}>[ ]?)?(?P<findent>[ \t]*)(?P<fence>`{3,}|~{3,})(?P<info>[^\n]*)
+    | [ ]{0,3}(?P<atx>\#{1,6})(?P<title>[ \t][^\n]*)?$
+    | [ ]{0,3}(?P<setext>=+|-+)[ \t]*$
+    | [ \t]*\d+[.)](?:[ \t]+|$)(?P<ordered>[^\n]*)
+    | [ \t]*[-*\u2022][ \t]+(?P<bullet>[^\n]*)
+    | [ \t]*(?P<step>[Ss][Tt][Ee][Pp][ \t]*\d+[ \t]*:[^\n]*)
+    )""",
+    re.MULTILINE | re.VERBOSE,
+)
+_BULLET = re.compile(r"[ \t]*[-*\u2022][ \t]+([^\n]*)")  # "- " that wasn't a setext underline
+# No part of a link or image may run past the start of the next one: alt
+# text stops at "[", URLs at "(", so a line of unclosed "![](" or "[a]("
+# costs one short attempt per opener instead of a rescan to the line's end.
+_IMAGE = re.compile(r"!\[([^\[\]\n]*)\]\(([^()\s]+)(?:[ \t]+\"[^\"\n]*\")?\)")
+# Link text may itself hold an image: [![badge](img)](target) is how badges
+# link out. No (?<!!) lookbehind: a leading literal "[" keeps the scan fast,
+# and matches right after "!" (images) are dropped in Python instead.
+_LINK = re.compile(
+    r"\[((?:[^\[\]\n]|!\[[^\[\]\n]*\]\([^()\n]*\))*)\]\(([^()\s]+)(?:[ \t]+\"[^\"\n]*\")?\)"
+)
+_URL = re.compile(r"https?://[^\s<>]+")
+_URL_TRAILING = ".,;:!?'\""
+
+
+# Token records are plain dataclasses: a frozen __init__ costs about three
+# times as much, and a dense README builds thousands of them.
+@dataclass
+class Heading:
+    level: int
+    text: str
+    line: int  # 0-based line index
+    start: int  # offset in Document.text of the heading (setext: its title line)
+    end: int  # offset just past the heading's last line (setext: the underline)
+
+
+@dataclass
+class FencedBlock:
+    fence: str  # opening fence, e.g. "```" or "~~~~"
+    info: str  # info string after the fence ("python", "bash", "")
+    start_line: int
+    end_line: int  # closing fence line, or last line if unclosed
+    closed: bool
+
+
+@dataclass
+class ListItem:
+    kind: str  # "bullet", "ordered" or "step"
+    line: int
+    text: str
+
+
+@dataclass
+class Link:
+    text: str
+    url: str
+    line: int
+    is_image: bool
+
+
+@dataclass
+class Document:
+    text: str  # the parsed text, line endings normalised to "\n"
+    lines: List[str]
+    headings: List[Heading] = field(default_factory=list)
+    code_blocks: List[FencedBlock] = field(default_factory=list)
+    links: List[Link] = field(default_factory=list)  # [text](url), images excluded
+    images: List[Link] = field(default_factory=list)  # ![alt](url)
+    urls: List[Link] = field(default_factory=list)  # every http(s) URL, in text order
+    bullets: int = 0
+    steps: int = 0  # ordered items and "Step N:" lines
+    # (kind, start, end) text offsets per list item; ListItems are built on
+    # demand, since scoring only needs the counts and dense READMEs have thousands.
+    _items: List[Tuple[str, int, int]] = field(default_factory=list, repr=False)
+
+    @property
+    def list_items(self) -> List[ListItem]:
+        out, line, pos = [], 0, 0
+        for kind, start, end in self._items:
+            line += self.text.count("\n", pos, start)
+            pos = start
+            out.append(ListItem(kind, line, self.text[start:end].strip()))
+        return out
+
+
+def _clean_bare_url(url: str) -> str:
+    # Prose punctuation and an unbalanced closing paren aren't part of the URL.
+    url = url.rstrip(_URL_TRAILING)
+    while url.endswith(")") and url.count(")") > url.count("("):
+        url = url[:-1].rstrip(_URL_TRAILING)
+    return url
+
+
+class _Spans:
+    """Sorted, non-overlapping [start, end) offset ranges with O(log n) lookup."""
+
+    def __init__(self) -> None:
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+
+    def add(self, start: int, end: int) -> None:
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __contains__(self, pos: int) -> bool:
+        i = bisect.bisect_right(self.starts, pos) - 1
+        return i >= 0 and pos < self.ends[i]
+
+
+def _indent(ws: str) -> int:
+    return len(ws.expandtabs(4)) if "\t" in ws else len(ws)
+
+
+def _block_tokens(doc: Document) -> _Spans:
+    """Headings, list items and fenced blocks; returns the code ranges."""
+    text = doc.text
+    n = len(text)
+    code = _Spans()
+    items = doc._items
+    bullets = steps = 0
+    # Offset just past the last block token's line (outside code): a setext
+    # underline right after it has no paragraph to turn into a title.
+    block_end = -1
+    last_end = 0  # same, but for the "did the list item end?" check below
+    open_fence = None  # (fence, info, start offset, start line, max closing indent, quoted)
+    # Content column of the open list item: a fence nested in the item
+    # ("1. Clone:" then "    ```bash") may be indented up to 3 past it.
+    item_indent = None
+    # Line numbers are only counted for fences and headings; list items keep
+    # offsets (Document.list_items turns them into lines on demand).
+    line, pos = 0, 0
+    # Offsets into "\n" + text: m.start() is the line's start in text, and
+    # every other match offset is one past its position in text.
+    for m in _BLOCK.finditer("\n" + text):
+        kind = m.lastgroup
+        if open_fence is not None and kind != "info":
+            continue  # inside code only a closing fence means anything
+        start = m.start()
+
+        if kind == "info":
+            fence = m.group("fence")
+            indent = _indent(m.group("findent"))
+            line += text.count("\n", pos, start)
+            pos = start
+            if open_fence is not None:
+                if (
+                    fence[0] == open_fence[0][0]
+                    and len(fence) >= len(open_fence[0])
+                    and indent <= open_fence[4]
+                    and bool(m.group("quote")) == open_fence[5]
+                    and not m.group("info").strip()
+                ):
+                    code.add(open_fence[2], m.end() - 1)
+                    doc.code_blocks.append(FencedBlock(open_fence[0], open_fence[1], open_fence[3], line, True))
+                    block_end = last_end = m.end()
+                    open_fence = None
+                continue
+
+            if indent > 3 and item_indent is not None:
+                # A less-indented line after a blank one ended the item since
+                # the last token (right after text it's a lazy continuation).
+                blank = False
+                for between in text[last_end:start].split("\n")[:-1]:
+                    stripped = between.lstrip()
+                    if not stripped:
+                        blank = True
+                        continue
+                    if blank and _indent(between[: len(between) - len(stripped)]) < item_indent:
+                        item_indent = None
+                        break
+                    blank = False
+            last_end = m.end()
+
+            quoted = bool(m.group("quote"))
+            limit = 3 if item_indent is None or quoted else item_indent + 3
+            if indent > limit:
+                continue  # indented code, not a fence
+            info = m.group("info")
+            if fence[0] == "`" and "`" in info:
+                continue  # ```js``` inline, not a fence
+            if item_indent is not None and (quoted or indent < item_indent):
+                item_indent = None
+            open_fence = (fence, info.strip(), start, line, limit, quoted)
+            block_end = m.end()
+        elif kind == "atx" or kind == "title":
+            line += text.count("\n", pos, start)
+            pos = start
+            title = (m.group("title") or "").strip()
+            if title.endswith("#"):
+                # Closing sequence: trailing #s after a space, or nothing but #s.
+                bare = title.rstrip("#")
+                if not bare or bare[-1] in " \t":
+                    title = bare.rstrip()
+            doc.headings.append(Heading(len(m.group("atx")), title, line, start, min(m.end(), n)))
+            block_end = last_end = m.end()
+            item_indent = None
+        elif kind == "setext":
+            last_end = m.end()
+            title_start = text.rfind("\n", 0, start - 1) + 1
+            prev = text[title_start : start - 1].strip() if start else ""
+            if prev and block_end != start and prev[0] not in (">", "|"):
+                line += text.count("\n", pos, start)
+                pos = start
+                level = 1 if m.group("setext")[0] == "=" else 2
+                doc.headings.append(Heading(level, prev, line - 1, title_start, min(m.end(), n)))
+                block_end = m.end()
+                item_indent = None
+                continue
+            bm = _BULLET.match(text, start)
+            if bm:
+                items.append(("bullet", bm.start(1), bm.end(1)))
+                bullets += 1
+                block_end = m.end()
+                item_indent = bm.start(1) - start
+        else:
+            # kind is the item alternative's own group: "ordered", "bullet" or "step".
+            item_start, item_end = m.span(kind)
+            items.append((kind, item_start - 1, item_end - 1))
+            if kind == "bullet":
+                bullets += 1
+            else:
+                steps += 1
+            item_indent = None if kind == "step" else item_start - 1 - start
+            block_end = last_end = m.end()
+
+    if open_fence is not None:
+        # CommonMark: an unclosed fence runs to the end of the document.
+        code.add(open_fence[2], n + 1)
+        doc.code_blocks.append(FencedBlock(open_fence[0], open_fence[1], open_fence[3], len(doc.lines) - 1, False))
+    doc.bullets, doc.steps = bullets, steps
+    return code
+
+
+def _inline_tokens(doc: Document, code: _Spans) -> None:
+    """Links (incl. linked badges), images and bare URLs outside code."""
+    text = doc.text
+    urls = []  # (offset, Link)
+
+    def scan(regex):
+        line, pos = 0, 0
+        for m in regex.finditer(text):
+            start = m.start()
+            if code and start in code:
+                continue
+            line += text.count("\n", pos, start)
+            pos = start
+            yield m, line
+
+    link_spans, image_spans = _Spans(), _Spans()
+    for m, line in scan(_LINK):
+        if m.start() and text[m.start() - 1] == "!":
+            continue  # an image; the _IMAGE scan has it
+        link = Link(m.group(1), m.group(2), line, False)
+        doc.links.append(link)
+        link_spans.add(m.start(), m.end())
+        if link.url.startswith(("http://", "https://")):
+            urls.append((m.start(2), link))
+    for m, line in scan(_IMAGE):
+        image = Link(m.group(1), m.group(2), line, True)
+        doc.images.append(image)
+        image_spans.add(m.start(), m.end())
+        if image.url.startswith(("http://", "https://")):
+            urls.append((m.start(2), image))
+    for m, line in scan(_URL):
+        start = m.start()
+        if (link_spans and start in link_spans) or (image_spans and start in image_spans):
+            continue
+        urls.append((start, Link("", _clean_bare_url(m.group(0)), line, False)))
+    urls.sort(key=lambda u: u[0])
+    doc.urls.extend(link for _, link in urls)
+
+
+def parse_markdown(text: str) -> Document:
+    """Build the document model: one scan for block tokens, one per inline kind."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    doc = Document(text=text, lines=lines)
+    code = _block_tokens(doc)
+    _inline_tokens(doc, code)
+    return doc
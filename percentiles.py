@@ -0,0 +1,219 @@
+"""
+Percentile ranks against a reference corpus, via mergeable KLL sketches.
+
+Why this exists:
+- an `overall` of 6.35 means little on its own; "better than 82% of the
+  corpus" is what people actually want to know
+- scanning the corpus per lookup doesn't scale, and shipping the corpus
+  with the tool isn't an option
+
+So each metric (overall + the four dimensions) gets a KLL quantile sketch:
+a few hundred numbers per metric, built once from batch results, stored in
+a small JSON file. Sketches built on different shards merge into one with
+the same error guarantees. Lookups are a bisect over a precomputed CDF.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import random
+from typing import Dict, Iterable, List, Tuple
+
+REFERENCE_FORMAT = "wpgs-quantiles"
+REFERENCE_VERSION = 1
+
+METRICS = (
+    "overall",
+    "problem_clarity",
+    "novelty_trend_fit",
+    "distribution_potential",
+    "execution_quality",
+)
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang, Liberty 2016), stdlib-only.
+
+    Level h holds items of weight 2**h. When the sketch is over capacity,
+    the lowest over-full level is sorted and every other item (random
+    offset) is promoted to the next level. Capacities shrink geometrically
+    (c = 2/3) towards the lower levels, so space is O(k) overall.
+    """
+
+    _C = 2.0 / 3.0
+
+    def __init__(self, k: int = 200, seed: int = 0) -> None:
+        self.k = k
+        self.n = 0
+        self.levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - h - 1
+        return max(2, int(math.ceil(self.k * self._C**depth)))
+
+    def _size(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self) -> None:
+        while self._size() >= self._max_size():
+            for h, level in enumerate(self.levels):
+                if len(level) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append([])
+                    level.sort()
+                    # Odd item out stays behind so total weight is preserved.
+                    keep = [level.pop()] if len(level) % 2 else []
+                    offset = self._rng.randint(0, 1)
+                    self.levels[h + 1].extend(level[offset::2])
+                    self.levels[h] = keep
+                    break
+
+    def update(self, value: float) -> None:
+        self.levels[0].append(float(value))
+        self.n += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, level in enumerate(other.levels):
+            self.levels[h].extend(level)
+        self.n += other.n
+        self._compress()
+
+    def weighted_items(self) -> List[Tuple[float, int]]:
+        items = [(v, 1 << h) for h, level in enumerate(self.levels) for v in level]
+        items.sort()
+        return items
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "n": self.n, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        sk = cls(k=int(data["k"]))
+        sk.n = int(data["n"])
+        sk.levels = [[float(v) for v in level] for level in data["levels"]] or [[]]
+        return sk
+
+
+class Ranker:
+    """Frozen CDF over a sketch: percentile_rank is two bisects."""
+
+    def __init__(self, sketch: KLLSketch) -> None:
+        self.values: List[float] = []
+        self.cum: List[int] = []  # cumulative weight up to and including values[i]
+        total = 0
+        for v, w in sketch.weighted_items():
+            total += w
+            if self.values and self.values[-1] == v:
+                self.cum[-1] = total
+            else:
+                self.values.append(v)
+                self.cum.append(total)
+        self.total = total
+
+    def _weight_below(self, i: int) -> int:
+        return self.cum[i - 1] if i > 0 else 0
+
+    def percentile_rank(self, value: float) -> float | None:
+        """
+        Mid-rank percentile: % of the corpus strictly below value, plus half
+        of the ties. Scores are discrete (0.5 steps), so ties matter.
+        """
+        if not self.total:
+            return None
+        lo = bisect.bisect_left(self.values, value)
+        hi = bisect.bisect_right(self.values, value)
+        below = self._weight_below(lo)
+        equal = self._weight_below(hi) - below
+        return round(100.0 * (below + equal / 2.0) / self.total, 1)
+
+
+class ReferenceSketches:
+    """One KLL sketch per metric, persisted together as a small JSON file."""
+
+    def __init__(self, k: int = 200) -> None:
+        self.k = k
+        self.sketches: Dict[str, KLLSketch] = {m: KLLSketch(k=k) for m in METRICS}
+        self._rankers: Dict[str, Ranker] | None = None
+
+    def add_payload(self, payload: dict) -> None:
+        """Add one scored-repo payload (score --format json / batch line)."""
+        if "overall" not in payload or payload.get("overall") is None:
+            return
+        self.sketches["overall"].update(payload["overall"])
+        for dim, val in payload.get("scores", {}).items():
+            if dim in self.sketches:
+                self.sketches[dim].update(val["score"])
+        self._rankers = None
+
+    def merge(self, other: "ReferenceSketches") -> None:
+        for metric, sketch in other.sketches.items():
+            self.sketches.setdefault(metric, KLLSketch(k=self.k)).merge(sketch)
+        self._rankers = None
+
+    @property
+    def n(self) -> int:
+        return self.sketches["overall"].n
+
+    def percentiles(self, payload: dict) -> Dict[str, float | None]:
+        """Percentile rank of overall + each dimension in a payload."""
+        if self._rankers is None:
+            self._rankers = {m: Ranker(s) for m, s in self.sketches.items()}
+        out: Dict[str, float | None] = {}
+        if payload.get("overall") is not None:
+            out["overall"] = self._rankers["overall"].percentile_rank(payload["overall"])
+        for dim, val in payload.get("scores", {}).items():
+            if dim in self._rankers:
+                out[dim] = self._rankers[dim].percentile_rank(val["score"])
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "format": REFERENCE_FORMAT,
+            "version": REFERENCE_VERSION,
+            "sketches": {m: s.to_dict() for m, s in self.sketches.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReferenceSketches":
+        if data.get("format") != REFERENCE_FORMAT or data.get("version") != REFERENCE_VERSION:
+            raise ValueError(
+                f"Not a v{REFERENCE_VERSION} {REFERENCE_FORMAT} file: "
+                f"format={data.get('format')!r}, version={data.get('version')!r}"
+            )
+        sketches = {m: KLLSketch.from_dict(s) for m, s in data["sketches"].items()}
+        ref = cls(k=max((s.k for s in sketches.values()), default=200))
+        ref.sketches.update(sketches)
+        return ref
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "ReferenceSketches":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def iter_result_payloads(paths: Iterable[str]):
+    """Yield scored payloads from batch JSONL files, skipping error records."""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                rec = json.loads(line)
+                if "error" not in rec:
+                    yield rec
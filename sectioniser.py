@@ -0,0 +1,230 @@
+"""
+Markdown sectioniser: heading tree with byte offsets, plus budgeted selection.
+
+Why this exists:
+- long READMEs (changelogs, API references) make both the heuristic scan and
+  any LLM prompt much more expensive than the signal needs
+- the parts that matter for scoring are few and predictable: the top
+  section, install, usage/quickstart/examples, demo
+- the same map answers "where does this quote live?" for the `where` field
+  PROMPT_README_TO_SIGNALS asks for, without another model call
+
+Headings come from the markdown_doc model, so section boundaries follow
+the same rules the evaluator scores with. Offsets are byte offsets into
+the UTF-8 encoding of the parsed text (line endings normalised to "\n"),
+so slices are cheap and stable.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from markdown_doc import Document, parse_markdown
+
+
+@dataclass
+class Section:
+    level: int  # 0 = document root (preamble before the first heading)
+    title: str
+    start: int  # byte offset of the heading line (root: 0)
+    body_start: int  # byte offset just past the heading line
+    end: int  # byte offset where this section (including children) ends
+    children: List["Section"] = field(default_factory=list)
+
+    @property
+    def own_end(self) -> int:
+        """End of this section's own text, before its first child heading."""
+        return self.children[0].start if self.children else self.end
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+# `where` labels, in the vocabulary PROMPT_README_TO_SIGNALS uses.
+_WHERE_PATTERNS: Tuple[Tuple[str, re.Pattern], ...] = tuple(
+    (label, re.compile(pattern))
+    for label, pattern in (
+        ("install", r"(?i)\b(install|installation|get(ting)?\s+started|setup|set\s+up|requirements|prerequisites?|dependencies)\b"),
+        ("usage", r"(?i)\b(usage|quick\s*start|how\s+to|cli|commands?|run(ning)?)\b"),
+        ("example", r"(?i)\b(examples?|tutorials?|recipes?)\b"),
+        ("demo", r"(?i)\b(demo|screenshots?|preview|gallery|showcase)\b"),
+        ("faq", r"(?i)\b(faq|questions)\b"),
+    )
+)
+
+# Which labels feed which dimension. "top section" is the title/intro.
+DIMENSION_WHERE: Dict[str, Tuple[str, ...]] = {
+    "problem_clarity": ("top section", "faq"),
+    "novelty_trend_fit": ("top section", "demo"),
+    "distribution_potential": ("top section", "demo", "usage", "example"),
+    "execution_quality": ("install", "usage", "example"),
+}
+
+# Selection priority when the budget can't fit everything.
+_WHERE_PRIORITY = ("top section", "install", "usage", "example", "demo", "faq")
+
+def _byte_offsets(text: str, offsets: List[int]) -> List[int]:
+    """Sorted character offsets -> UTF-8 byte offsets, in one pass."""
+    if text.isascii():
+        return offsets
+    out: List[int] = []
+    nbytes, prev = 0, 0
+    for off in offsets:
+        nbytes += len(text[prev:off].encode("utf-8"))
+        prev = off
+        out.append(nbytes)
+    return out
+
+
+def build_section_tree(text: str, doc: Document | None = None) -> Tuple[Section, bytes]:
+    """
+    Build the heading tree. Returns (root, utf-8 bytes of the parsed text).
+
+    Headings are the document model's (ATX and setext, nothing inside
+    fenced code). Pass `doc` if the caller already parsed `text`.
+    """
+    if doc is None:
+        doc = parse_markdown(text)
+    data = doc.text.encode("utf-8")
+    n = len(data)
+    root = Section(level=0, title="", start=0, body_start=0, end=n)
+    stack: List[Section] = [root]
+
+    bounds = _byte_offsets(doc.text, [off for h in doc.headings for off in (h.start, h.end)])
+    for i, heading in enumerate(doc.headings):
+        start, body_start = bounds[2 * i], bounds[2 * i + 1]
+        while stack[-1].level >= heading.level:
+            stack.pop().end = start
+        sec = Section(level=heading.level, title=heading.text, start=start, body_start=body_start, end=n)
+        stack[-1].children.append(sec)
+        stack.append(sec)
+    return root, data
+
+
+def classify_section(sec: Section, is_top: bool) -> str | None:
+    """Map a section to a `where` label, or None if it isn't scoring-relevant."""
+    if is_top:
+        return "top section"
+    for label, pattern in _WHERE_PATTERNS:
+        if pattern.search(sec.title):
+            return label
+    return None
+
+
+def labelled_spans(root: Section) -> List[Tuple[int, int, str]]:
+    """
+    (start, end, where) byte spans in document order.
+
+    The top section is the preamble plus the first heading's own text —
+    that's the README's "first screen" (title + one-liner + badges).
+    Other labelled sections span their subsections too, so an "Installation"
+    section keeps its "### macOS" / "### Windows" children.
+    """
+    out: List[Tuple[int, int, str]] = []
+    headings = [s for s in root.walk() if s.level > 0]
+    first = headings[0] if headings else None
+
+    if root.own_end > 0:
+        out.append((0, root.own_end, "top section"))
+    for sec in headings:
+        label = classify_section(sec, is_top=sec is first)
+        if label == "top section":
+            out.append((sec.start, sec.own_end, label))
+        elif label:
+            out.append((sec.start, sec.end, label))
+    return out
+
+
+def where_at(root: Section, offset: int) -> str | None:
+    """`where` label of the innermost labelled span containing a byte offset."""
+    found = None
+    for start, end, label in labelled_spans(root):
+        if start <= offset < end:
+            found = label
+    return found
+
+
+@dataclass(frozen=True)
+class Selection:
+    parts: Tuple[Tuple[str, str], ...]  # (where, text) in document order
+
+    @property
+    def text(self) -> str:
+        return "\n".join(body for _, body in self.parts)
+
+    def labelled_text(self) -> str:
+        """Text with [where: ...] markers, for prompts."""
+        return "\n".join(f"[where: {where}]\n{body}" for where, body in self.parts)
+
+
+def _truncate(body: str, limit: int) -> str:
+    """Cut body to at most `limit` chars at a line end, closing a fence the cut leaves open."""
+    while limit > 0:
+        cut = body.rfind("\n", 0, limit + 1)
+        part = body[:cut] if cut > 0 else body[:limit]
+        blocks = parse_markdown(part).code_blocks
+        if not blocks or blocks[-1].closed:
+            return part
+        # Close it the way it was opened (same indent / quote marker and fence).
+        opening = part.split("\n")[blocks[-1].start_line]
+        closing = opening[: opening.index(blocks[-1].fence) + len(blocks[-1].fence)]
+        if len(part) + 1 + len(closing) <= limit:
+            return f"{part}\n{closing}"
+        limit = cut - 1 if cut > 0 else 0
+    return ""
+
+
+def select_sections(
+    text: str,
+    *,
+    dimensions: List[str] | None = None,
+    max_chars: int | None = 4000,
+    max_tokens: int | None = None,
+    doc: Document | None = None,
+) -> Selection:
+    """
+    Pick the sections relevant to the given dimensions (default: all four),
+    within a character budget (or token budget, at ~4 chars/token).
+
+    Budget is spent in _WHERE_PRIORITY order, so the intro and install path
+    survive before demos and FAQs. A section that doesn't fit whole is
+    truncated at a line boundary rather than skipped, with any fence it
+    leaves open closed again, so it can't swallow the sections after it
+    once parts are restored to document order.
+    Pass `doc` if the caller already parsed `text`.
+    """
+    if max_tokens is not None:
+        max_chars = max_tokens * 4
+
+    wanted = set()
+    for dim in dimensions or DIMENSION_WHERE.keys():
+        wanted.update(DIMENSION_WHERE[dim])
+
+    root, data = build_section_tree(text, doc)
+    candidates = [span for span in labelled_spans(root) if span[2] in wanted]
+    candidates.sort(key=lambda span: (_WHERE_PRIORITY.index(span[2]), span[0]))
+
+    remaining = max_chars if max_chars is not None else float("inf")
+    chosen: List[Tuple[int, int, str, str]] = []
+    for start, end, label in candidates:
+        if remaining <= 0:
+            break
+        # Nested labelled sections are already covered by their parent (or vice versa).
+        if any(start < c_end and c_start < end for c_start, c_end, _, _ in chosen):
+            continue
+        body = data[start:end].decode("utf-8", errors="replace").strip("\n")
+        if not body.strip():
+            continue
+        if len(body) > remaining:
+            body = _truncate(body, int(remaining))
+            if not body.strip():
+                continue
+        remaining -= len(body) + 1
+        chosen.append((start, end, label, body))
+
+    chosen.sort(key=lambda c: c[0])
+    return Selection(parts=tuple((label, body) for _, _, label, body in chosen))
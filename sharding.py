@@ -0,0 +1,54 @@
+"""
+Deterministic repo -> shard assignment for multi-node batch runs.
+
+Consistent hashing on "owner/name": each shard owns many virtual points on
+a 64-bit hash ring and a repo goes to the first point at or after its own
+hash. Going from N to N+1 shards only moves the repos the new shard's
+points capture (~1/(N+1) of them); everything else stays where it was, so
+result stores and caches on existing nodes stay warm.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+from functools import lru_cache
+from typing import List, Tuple
+
+DEFAULT_VNODES = 128
+
+
+def _hash64(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse "i/N" (0-based i). Raises ValueError on anything else."""
+    try:
+        i_str, n_str = spec.split("/", 1)
+        i, n = int(i_str), int(n_str)
+    except ValueError:
+        raise ValueError(f'shard must look like "i/N", got: {spec!r}') from None
+    if n < 1 or not 0 <= i < n:
+        raise ValueError(f"shard index must satisfy 0 <= i < N, got: {spec!r}")
+    return i, n
+
+
+@lru_cache(maxsize=32)
+def _ring(n: int, vnodes: int) -> Tuple[List[int], List[int]]:
+    points = sorted((_hash64(f"shard-{node}-{v}"), node) for node in range(n) for v in range(vnodes))
+    return [h for h, _ in points], [node for _, node in points]
+
+
+def shard_of(repo: str, n: int, *, vnodes: int = DEFAULT_VNODES) -> int:
+    """Shard index for a repo. GitHub names are case-insensitive, so we are too."""
+    if n == 1:
+        return 0
+    hashes, nodes = _ring(n, vnodes)
+    i = bisect.bisect_left(hashes, _hash64(repo.strip().lower()))
+    return nodes[i % len(nodes)]
+
+
+def select_shard(repos: List[str], index: int, n: int, *, vnodes: int = DEFAULT_VNODES) -> List[str]:
+    """The repos shard `index` of `n` is responsible for, in input order."""
+    return [repo for repo in repos if shard_of(repo, n, vnodes=vnodes) == index]
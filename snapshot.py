@@ -0,0 +1,293 @@
+"""
+Binary snapshots of batch results, opened with mmap.
+
+Why this exists:
+- every analysis session used to start by json.loads-ing every batch
+  payload, which takes minutes on a large corpus before the first query
+- most analysis only needs the numbers (dimension scores, overall,
+  integer signals) and the repo name, not the "why" strings
+
+A snapshot is one file:
+
+    header      magic, version, counts, record size, key-set hash, offsets
+    keys        dimension names then signal names, "\\n"-joined UTF-8
+    records     fixed width, little-endian:
+                  float32 x len(dims)   dimension scores (NaN = not scored)
+                  float32               overall (NaN = partial run)
+                  int32 x len(signals)  signals in sorted-key order (-1 = not computed)
+                  uint32, uint32        repo name offset / length in the name table
+    names       "owner/name@ref" strings, UTF-8, back to back
+
+Opening maps the file and casts the record block to memoryviews in place:
+no parsing, no copies, so a million-repo snapshot opens in milliseconds
+and pages in only what a query touches. Snapshot.to_numpy() gives the same
+bytes as a NumPy structured array when NumPy is installed.
+
+The header stores a hash of the key set; a snapshot written under a
+different set of dimensions/signals is rejected instead of misread.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import struct
+import sys
+from typing import Dict, Iterable, List, Sequence
+
+SNAPSHOT_MAGIC = b"WPGSSNAP"
+SNAPSHOT_VERSION = 1
+
+# magic, version, n_dims, n_signals, record_size, keyset_hash,
+# count, keys_offset, records_offset, names_offset, names_size
+_HEADER = struct.Struct("<8sHHII16sQQQQQ")
+_ALIGN = 8
+_MISSING_SIGNAL = -1
+
+
+def keyset_hash(dims: Sequence[str], signals: Sequence[str]) -> bytes:
+    """16-byte hash identifying a (dimensions, signals) layout."""
+    blob = "\n".join(dims).encode("utf-8") + b"\0" + "\n".join(signals).encode("utf-8")
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+
+def default_signal_keys() -> List[str]:
+    """The evaluator's reported signals, sorted: the layout batch snapshots use."""
+    from evaluator import SIGNALS
+
+    return sorted(name for name, sig in SIGNALS.items() if sig.public)
+
+
+def _record_struct(n_dims: int, n_signals: int) -> struct.Struct:
+    return struct.Struct(f"<{n_dims + 1}f{n_signals}iII")
+
+
+def _pad(n: int) -> int:
+    return -n % _ALIGN
+
+
+def _score(value: float) -> float | None:
+    # float32 round trip: 6.35 comes back as 6.349999904..., scores have 2 decimals.
+    return None if math.isnan(value) else round(value, 4)
+
+
+def write_snapshot(path: str, records: Iterable[dict], *, signal_keys: Sequence[str] | None = None) -> int:
+    """
+    Write scored payloads (batch records / score --format json) to `path`.
+
+    Error records are skipped. signal_keys defaults to the evaluator's
+    signal registry, so snapshots from different runs (and partial
+    --dimensions runs) share one layout. Returns the number of records written.
+    """
+    from batch import DIM_ORDER
+
+    signal_keys = list(default_signal_keys() if signal_keys is None else signal_keys)
+    if signal_keys != sorted(signal_keys):
+        raise ValueError("signal_keys must be sorted")
+
+    rec_struct = _record_struct(len(DIM_ORDER), len(signal_keys))
+    keys_blob = "\n".join(list(DIM_ORDER) + signal_keys).encode("utf-8")
+    keys_offset = _HEADER.size
+    records_offset = keys_offset + len(keys_blob) + _pad(keys_offset + len(keys_blob))
+
+    count = 0
+    names = bytearray()
+    with open(path, "wb") as f:
+        # Records stream straight to disk; the header is written last, once
+        # the count is known, so payloads never all sit in memory at once.
+        f.write(b"\0" * _HEADER.size)
+        f.write(keys_blob)
+        f.write(b"\0" * (records_offset - keys_offset - len(keys_blob)))
+        for rec in records:
+            if "error" in rec:
+                continue
+            scores = rec.get("scores", {})
+            signals = rec.get("signals", {})
+            overall = rec.get("overall")
+            name = rec["repo"].encode("utf-8")
+            f.write(
+                rec_struct.pack(
+                    *(float(scores[d]["score"]) if d in scores else math.nan for d in DIM_ORDER),
+                    math.nan if overall is None else float(overall),
+                    *(int(signals.get(key, _MISSING_SIGNAL)) for key in signal_keys),
+                    len(names),
+                    len(name),
+                )
+            )
+            names += name
+            count += 1
+        f.write(names)
+        f.seek(0)
+        f.write(
+            _HEADER.pack(
+                SNAPSHOT_MAGIC,
+                SNAPSHOT_VERSION,
+                len(DIM_ORDER),
+                len(signal_keys),
+                rec_struct.size,
+                keyset_hash(DIM_ORDER, signal_keys),
+                count,
+                keys_offset,
+                records_offset,
+                records_offset + count * rec_struct.size,
+                len(names),
+            )
+        )
+    return count
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file.
+
+    Row access goes through memoryviews cast over the mapped record block
+    (floats and ints share the same bytes), so nothing is decoded until
+    it's read. Use as a context manager, or call close().
+    """
+
+    def __init__(self, path: str, *, signal_keys: Sequence[str] | None = None) -> None:
+        if sys.byteorder != "little":
+            raise ValueError("snapshots are little-endian; memoryview access needs a little-endian host")
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open(path, signal_keys)
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _open(self, path: str, expected_signals: Sequence[str] | None) -> None:
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"Not a {SNAPSHOT_MAGIC.decode()} file: {path}")
+        (
+            magic,
+            version,
+            n_dims,
+            n_signals,
+            record_size,
+            digest,
+            count,
+            keys_offset,
+            records_offset,
+            names_offset,
+            names_size,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Not a v{SNAPSHOT_VERSION} {SNAPSHOT_MAGIC.decode()} file: {path}")
+
+        keys = self._mm[keys_offset:records_offset].rstrip(b"\0").decode("utf-8").split("\n")
+        self.dims: List[str] = keys[:n_dims]
+        self.signal_keys: List[str] = keys[n_dims:] if n_signals else []
+        if len(self.signal_keys) != n_signals or keyset_hash(self.dims, self.signal_keys) != digest:
+            raise ValueError(f"Snapshot key table doesn't match its header hash: {path}")
+        if expected_signals is not None and list(expected_signals) != self.signal_keys:
+            raise ValueError(
+                f"Snapshot signal keys differ from the expected set: {path} "
+                f"(has {len(self.signal_keys)}, expected {len(expected_signals)})"
+            )
+        if record_size != _record_struct(n_dims, n_signals).size:
+            raise ValueError(f"Unexpected record size {record_size} in {path}")
+        if names_offset + names_size > len(self._mm) or records_offset + count * record_size > names_offset:
+            raise ValueError(f"Truncated snapshot: {path}")
+
+        self.count = count
+        self.record_size = record_size
+        self._records_offset = records_offset
+        self._names_offset = names_offset
+        self._width = record_size // 4
+        self._dim_index = {d: i for i, d in enumerate(self.dims)}
+        self._signal_index = {k: n_dims + 1 + i for i, k in enumerate(self.signal_keys)}
+        self._overall_col = n_dims
+        self._name_col = n_dims + 1 + n_signals
+        self._row_by_repo: Dict[str, int] | None = None
+
+        self._block = memoryview(self._mm)[records_offset : records_offset + count * record_size]
+        self._f = self._i = self._u = None  # memoryview can't cast to a zero-length shape
+        if count:
+            shape = [count, self._width]
+            self._f = self._block.cast("f", shape)
+            self._i = self._block.cast("i", shape)
+            self._u = self._block.cast("I", shape)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def repo(self, row: int) -> str:
+        start = self._names_offset + self._u[row, self._name_col]
+        return self._mm[start : start + self._u[row, self._name_col + 1]].decode("utf-8")
+
+    def score(self, row: int, dim: str) -> float | None:
+        return _score(self._f[row, self._dim_index[dim]])
+
+    def overall(self, row: int) -> float | None:
+        return _score(self._f[row, self._overall_col])
+
+    def signal(self, row: int, key: str) -> int | None:
+        value = self._i[row, self._signal_index[key]]
+        return None if value == _MISSING_SIGNAL else value
+
+    def find(self, repo: str) -> int | None:
+        """Row of "owner/name@ref" (index built on first call)."""
+        if self._row_by_repo is None:
+            self._row_by_repo = {self.repo(row): row for row in range(self.count)}
+        return self._row_by_repo.get(repo)
+
+    def row(self, row: int) -> dict:
+        """One record in payload shape (minus the "why" strings and docs fields)."""
+        return {
+            "repo": self.repo(row),
+            "overall": self.overall(row),
+            "scores": {
+                dim: {"score": self.score(row, dim)}
+                for dim in self.dims
+                if self.score(row, dim) is not None
+            },
+            "signals": {
+                key: self.signal(row, key)
+                for key in self.signal_keys
+                if self.signal(row, key) is not None
+            },
+        }
+
+    def column(self, name: str) -> List[float] | List[int]:
+        """All values of "overall", a dimension or a signal (raw: NaN / -1 for missing)."""
+        if name == "overall":
+            view, col = self._f, self._overall_col
+        elif name in self._dim_index:
+            view, col = self._f, self._dim_index[name]
+        elif name in self._signal_index:
+            view, col = self._i, self._signal_index[name]
+        else:
+            raise KeyError(name)
+        return [view[row, col] for row in range(self.count)]
+
+    def numpy_dtype(self):
+        import numpy as np
+
+        return np.dtype(
+            [(dim, "<f4") for dim in self.dims]
+            + [("overall", "<f4")]
+            + ([("signals", "<i4", (len(self.signal_keys),))] if self.signal_keys else [])
+            + [("name_offset", "<u4"), ("name_length", "<u4")]
+        )
+
+    def to_numpy(self):
+        """Zero-copy NumPy structured array over the record block (needs numpy)."""
+        import numpy as np
+
+        return np.frombuffer(self._mm, dtype=self.numpy_dtype(), count=self.count, offset=self._records_offset)
+
+    def close(self) -> None:
+        for name in ("_f", "_i", "_u", "_block"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        if not self._mm.closed:
+            self._mm.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
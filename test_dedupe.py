@@ -0,0 +1,126 @@
+"""Tests for dedupe and batch fan-out (offline, synthetic READMEs)."""
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from dedupe import content_hash, dedupe, estimate_jaccard, MinHasher, shingles
+from github_fetcher import ReadmeFetchResult
+
+
+_BASE = (
+    "# Starter\n"
+    "A batteries-included template for building command line tools in Python. "
+    "It ships with packaging, linting, tests, release automation and a docs site, "
+    "so you can focus on the code that makes your tool useful to other people.\n"
+    "## Install\npip install starter\n"
+    "## Usage\nstarter new mytool && cd mytool && make test\n"
+)
+
+
+class TestContentHash(unittest.TestCase):
+    def test_line_endings_and_trailing_space_ignored(self):
+        self.assertEqual(content_hash("a  \r\nb\n"), content_hash("a\nb"))
+
+    def test_different_text_differs(self):
+        self.assertNotEqual(content_hash("a"), content_hash("b"))
+
+
+class TestMinHash(unittest.TestCase):
+    def test_similar_texts_estimate_high(self):
+        h = MinHasher()
+        a = h.signature(shingles(_BASE))
+        b = h.signature(shingles(_BASE.replace("# Starter", "# Starter fork")))
+        c = h.signature(shingles("# Other\nSomething unrelated about databases and graphs.\n"))
+        self.assertGreater(estimate_jaccard(a, b), 0.7)
+        self.assertLess(estimate_jaccard(a, c), 0.2)
+
+
+class TestDedupe(unittest.TestCase):
+    def test_exact_and_near_clusters(self):
+        items = [
+            ("a/orig", _BASE),
+            ("b/mirror", _BASE + "\n"),
+            ("c/fork", _BASE.replace("starter new", "starter init")),
+            ("d/other", "# Other\nA graph database written in Rust.\n"),
+        ]
+        dd = dedupe(items)
+        self.assertEqual(dd.content_hash["a/orig"], dd.content_hash["b/mirror"])
+        self.assertEqual(len(dd.exact_groups), 3)
+        self.assertEqual(dd.cluster_id["a/orig"], dd.cluster_id["c/fork"])
+        self.assertNotEqual(dd.cluster_id["a/orig"], dd.cluster_id["d/other"])
+        self.assertEqual(dd.representative[dd.cluster_id["c/fork"]], "a/orig")
+
+    def test_large_bucket_of_template_clones(self):
+        # Thousands of clones land in the same LSH buckets; unions are per
+        # bucket member, not per pair, so this stays fast.
+        words = [f"w{i % 97}" for i in range(300)]
+        items = []
+        for i in range(1500):
+            w = list(words)
+            w[i % 300] = f"name{i}"
+            items.append((f"o/r{i}", " ".join(w)))
+        dd = dedupe(items)
+        self.assertEqual(len(set(dd.cluster_id.values())), 1)
+
+    def test_near_disabled(self):
+        items = [("a/orig", _BASE), ("c/fork", _BASE.replace("starter new", "starter init"))]
+        dd = dedupe(items, near=False)
+        self.assertNotEqual(dd.cluster_id["a/orig"], dd.cluster_id["c/fork"])
+
+
+def _fake_fetch(texts: dict):
+    def fetch(repo, ref="main"):
+        if repo not in texts:
+            raise ValueError(f"README not found for {repo}@{ref}.")
+        return ReadmeFetchResult(
+            repo=repo, ref=ref, filename="README.md", text=texts[repo],
+            source_url=f"https://raw.githubusercontent.com/{repo}/{ref}/README.md",
+        )
+    return fetch
+
+
+class TestBatchDedupe(unittest.TestCase):
+    TEXTS = {
+        "a/orig": _BASE,
+        "b/mirror": _BASE,
+        "c/fork": _BASE.replace("starter new", "starter init"),
+    }
+
+    def _run(self, **kw):
+        from batch import run_batch
+
+        with patch("github_fetcher.fetch_readme", side_effect=_fake_fetch(self.TEXTS)):
+            return run_batch(["a/orig", "b/mirror", "c/fork", "x/missing"], **kw)
+
+    def test_exact_duplicates_evaluated_once(self):
+        records, summary = self._run()
+        self.assertEqual(summary.evaluations, 2)
+        self.assertEqual(summary.reused_exact, 1)
+        self.assertEqual(records[1]["dedupe"]["reused_from"], "a/orig")
+        self.assertEqual(records[0]["scores"], records[1]["scores"])
+        # Near clustering is opt-in: by default clusters are exact groups.
+        self.assertNotEqual(records[0]["dedupe"]["cluster_id"], records[2]["dedupe"]["cluster_id"])
+        self.assertEqual(records[0]["dedupe"]["cluster_size"], 2)
+
+    def test_near_dedupe_clusters_without_reuse(self):
+        records, summary = self._run(near_dedupe=True)
+        self.assertEqual(summary.evaluations, 2)
+        self.assertEqual(records[0]["dedupe"]["cluster_id"], records[2]["dedupe"]["cluster_id"])
+        self.assertEqual(records[0]["dedupe"]["cluster_size"], 3)
+
+    def test_skip_near_duplicates(self):
+        records, summary = self._run(skip_near_duplicates=True)
+        self.assertEqual(summary.evaluations, 1)
+        self.assertEqual(summary.reused_near, 1)
+        self.assertEqual(records[2]["dedupe"]["reused_from"], "a/orig")
+
+    def test_fetch_error_recorded(self):
+        records, summary = self._run()
+        self.assertEqual(summary.fetch_errors, 1)
+        self.assertEqual(records[3]["repo"], "x/missing@main")
+        self.assertIn("error", records[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import unittest
 
-from evaluator import evaluate_readme
+from evaluator import SIGNALS, evaluate_readme, estimated_cost
 
 
 class TestDocsLinkCredit(unittest.TestCase):
@@ -134,5 +134,62 @@ class TestScoringCeilings(unittest.TestCase):
         self.assertIn("distinct angle", nt.why)
 
 
+class TestSignalRegistry(unittest.TestCase):
+    """Signals are lazy and memoised; partial scoring pays only for what it reads."""
+
+    README = (
+        "# MyLib\n"
+        "TL;DR: a new agent workflow tool.\n"
+        "## Installation\n"
+        "pip install mylib\n"
+        "## Usage\n"
+        "```python\nimport mylib\n```\n"
+    )
+
+    def test_deps_are_registered(self):
+        for sig in SIGNALS.values():
+            for dep in sig.deps:
+                self.assertIn(dep, SIGNALS)
+
+    def test_full_run_reports_all_public_signals(self):
+        ev = evaluate_readme(self.README)
+        public = {name for name, sig in SIGNALS.items() if sig.public}
+        self.assertEqual(set(ev.signals), public)
+
+    def test_partial_run_matches_full_and_costs_less(self):
+        full = evaluate_readme(self.README)
+        part = evaluate_readme(self.README, dimensions=["problem_clarity"])
+        self.assertEqual(list(part.scores), ["problem_clarity"])
+        self.assertEqual(part.scores["problem_clarity"], full.scores["problem_clarity"])
+        self.assertLess(part.signal_cost, full.signal_cost)
+        self.assertNotIn("code_blocks", part.signals)
+
+    def test_docs_primary_short_circuits(self):
+        # README has install/usage, so the docs-first check never runs.
+        ev = evaluate_readme(self.README, dimensions=["execution_quality"])
+        self.assertNotIn("docs_is_primary_onboarding", ev.signals)
+
+    def test_scores_only_full_run_keeps_short_circuits(self):
+        full = evaluate_readme(self.README)
+        lean = evaluate_readme(self.README, all_signals=False)
+        self.assertEqual(lean.scores, full.scores)
+        self.assertNotIn("docs_is_primary_onboarding", lean.signals)
+        self.assertLess(lean.signal_cost, full.signal_cost)
+
+    def test_dimensions_generator_accepted(self):
+        ev = evaluate_readme(self.README, dimensions=(d for d in ["execution_quality", "problem_clarity"]))
+        self.assertEqual(list(ev.scores), ["problem_clarity", "execution_quality"])
+
+    def test_unknown_dimension(self):
+        with self.assertRaises(ValueError):
+            evaluate_readme(self.README, dimensions=["vibes"])
+
+    def test_estimated_cost_includes_deps(self):
+        self.assertGreater(
+            estimated_cost(["docs_is_primary_onboarding"]),
+            SIGNALS["docs_is_primary_onboarding"].cost,
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
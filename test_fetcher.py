@@ -1,9 +1,14 @@
 """Tests for github_fetcher (offline, no network)."""
 from __future__ import annotations
 
+import gzip
 import unittest
+import zlib
+from unittest.mock import patch
 
-from github_fetcher import extract_docs_url
+import github_fetcher
+from github_fetcher import _decode_body, extract_docs_url
+from transport import HttpResponse
 
 
 class TestInvalidRepoError(unittest.TestCase):
@@ -51,5 +56,62 @@ class TestExtractDocsUrl(unittest.TestCase):
         self.assertEqual(url, "https://example.com/docs")
 
 
+class _EncodedTransport:
+    """Serves one body with a given Content-Encoding and records request headers."""
+
+    def __init__(self, body: bytes, encoding: str | None):
+        self.body = body
+        self.encoding = encoding
+        self.seen_headers: dict = {}
+
+    def get(self, url, headers, timeout, max_bytes=None):
+        self.seen_headers = headers
+        resp_headers = {"Content-Encoding": self.encoding} if self.encoding else {}
+        return HttpResponse(url, 200, resp_headers, self.body, 0.0)
+
+
+class TestCompressedTransfer(unittest.TestCase):
+    """gzip/deflate bodies are decoded, bounded, and their sizes recorded."""
+
+    TEXT = ("# MyLib\n" + "Install with pip install mylib.\n" * 200).encode("utf-8")
+
+    def setUp(self):
+        self.previous = github_fetcher.get_transport()
+
+    def tearDown(self):
+        github_fetcher.set_transport(self.previous)
+
+    def test_gzip_roundtrip_and_stats(self):
+        transport = _EncodedTransport(gzip.compress(self.TEXT), "gzip")
+        github_fetcher.set_transport(transport)
+        res = github_fetcher.fetch_readme("o/r")
+        self.assertEqual(res.text.encode("utf-8"), self.TEXT)
+        self.assertEqual(res.decoded_bytes, len(self.TEXT))
+        self.assertLess(res.wire_bytes, res.decoded_bytes / 5)
+        self.assertIn("gzip", transport.seen_headers["Accept-Encoding"])
+        self.assertEqual(github_fetcher.TRANSFER_LOG[-1].content_encoding, "gzip")
+
+    def test_deflate_zlib_and_raw(self):
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        raw_body = raw.compress(self.TEXT) + raw.flush()
+        self.assertEqual(_decode_body(zlib.compress(self.TEXT), "deflate"), self.TEXT)
+        self.assertEqual(_decode_body(raw_body, "deflate"), self.TEXT)
+
+    def test_identity_passthrough(self):
+        github_fetcher.set_transport(_EncodedTransport(self.TEXT, None))
+        res = github_fetcher.fetch_readme("o/r")
+        self.assertEqual(res.wire_bytes, res.decoded_bytes)
+
+    def test_compression_bomb_rejected(self):
+        bomb = gzip.compress(b"\0" * (4 * 1024 * 1024))
+        with self.assertRaises(ValueError):
+            _decode_body(bomb, "gzip", limit=1024 * 1024)
+
+    def test_bomb_is_treated_as_failed_docs_fetch(self):
+        github_fetcher.set_transport(_EncodedTransport(gzip.compress(b"\0" * 1024), "gzip"))
+        with patch.object(github_fetcher, "MAX_DECODED_BYTES", 100):
+            self.assertIsNone(github_fetcher.fetch_docs_page("https://example.com/docs"))
+
+
 if __name__ == "__main__":
     unittest.main()
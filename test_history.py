@@ -0,0 +1,90 @@
+"""Tests for history (offline: throwaway local git repo)."""
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from history import readme_commits, score_history
+
+
+def _git(path: str, *args: str) -> None:
+    subprocess.run(["git", "-C", path, *args], check=True, capture_output=True)
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class TestScoreHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+        _git(self.path, "init", "-q")
+        _git(self.path, "config", "user.email", "t@example.com")
+        _git(self.path, "config", "user.name", "t")
+        _git(self.path, "config", "commit.gpgsign", "false")
+        self.stamp = 1_700_000_000
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _commit(self, files: dict, message: str, remove: tuple = ()) -> None:
+        for name, text in files.items():
+            with open(os.path.join(self.path, name), "w", encoding="utf-8") as f:
+                f.write(text)
+        for name in remove:
+            _git(self.path, "rm", "-q", name)
+        _git(self.path, "add", "-A")
+        self.stamp += 86_400
+        env = dict(os.environ, GIT_COMMITTER_DATE=f"{self.stamp} +0000", GIT_AUTHOR_DATE=f"{self.stamp} +0000")
+        subprocess.run(["git", "-C", self.path, "commit", "-q", "-m", message], check=True, capture_output=True, env=env)
+
+    def test_time_series_and_blob_reuse(self):
+        thin = "# Lib\n"
+        rich = "# Lib\nTL;DR: fast.\n## Install\npip install lib\n## Usage\n```\nlib run\n```\n"
+        self._commit({"README.md": thin}, "init")
+        self._commit({"main.py": "print(1)\n"}, "code only")
+        self._commit({"README.md": rich}, "docs")
+        _git(self.path, "tag", "v1")
+        self._commit({"README.md": thin}, "revert")
+
+        points = score_history(self.path)
+        self.assertEqual(len(points), 3)  # "code only" doesn't touch the README
+        self.assertEqual([p.timestamp for p in points], sorted(p.timestamp for p in points))
+        self.assertGreater(points[1].overall, points[0].overall)
+        self.assertEqual(points[0].blob, points[2].blob)
+        self.assertEqual(points[0].scores, points[2].scores)
+        self.assertEqual(points[1].tags, ("v1",))
+
+    def test_candidate_order_and_deletion(self):
+        self._commit({"README.rst": "Lib\n===\n"}, "rst")
+        self._commit({"README.md": "# Lib\n"}, "md added")
+        self._commit({}, "md removed", remove=("README.md",))
+        names = [name for _, _, name, _ in readme_commits(self.path)]
+        self.assertEqual(names, ["README.rst", "README.md", "README.rst"])
+
+    def test_tags_only(self):
+        self._commit({"README.md": "# Lib\n"}, "init")
+        _git(self.path, "tag", "-a", "v0.1", "-m", "first")
+        self._commit({"README.md": "# Lib\nTL;DR: fast.\n"}, "more")
+        self._commit({"README.md": "# Lib\nTL;DR: faster.\n"}, "more again")
+        _git(self.path, "tag", "v0.2")
+
+        points = score_history(self.path, tags_only=True)
+        self.assertEqual([p.tags for p in points], [("v0.1",), ("v0.2",)])
+
+    def test_tags_only_follows_ref(self):
+        self._commit({"README.md": "# Lib\n"}, "init")
+        _git(self.path, "tag", "v1")
+        _git(self.path, "checkout", "-q", "-b", "side")
+        self._commit({"README.md": "# Lib\nTL;DR: side.\n"}, "side")
+        _git(self.path, "tag", "v-side")
+        _git(self.path, "checkout", "-q", "-")
+
+        self.assertEqual([p.tags for p in score_history(self.path, tags_only=True)], [("v1",)])
+        side = score_history(self.path, ref="side", tags_only=True)
+        self.assertEqual([p.tags for p in side], [("v1",), ("v-side",)])
+
+
+if __name__ == "__main__":
+    unittest.main()
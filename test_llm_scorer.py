@@ -0,0 +1,221 @@
+"""Tests for llm_scorer (offline: stub client + local stub HTTP server)."""
+from __future__ import annotations
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from llm_scorer import HttpLLMClient, LLMReply, LLMScorer, ResponseCache
+
+
+_EVIDENCE = {
+    "problem_clarity": [],
+    "novelty_trend_fit": [],
+    "distribution_potential": [],
+    "execution_quality": [],
+}
+
+_SCORES = {
+    "problem_clarity": {"score": 8, "reason": "Clear one-liner."},
+    "novelty_trend_fit": {"score": 6, "reason": "Some angle."},
+    "distribution_potential": {"score": 7, "reason": "Has a demo."},
+    "execution_quality": {"score": 5, "reason": "Install only."},
+}
+
+
+def _reply_for(prompt: str, scores: dict) -> str:
+    # Stage 2 prompts carry the signals JSON; stage 1 prompts carry the README.
+    if "Signals:\n" in prompt:
+        return json.dumps(scores)
+    return json.dumps(_EVIDENCE)
+
+
+class StubClient:
+    def __init__(self, scores: dict | None = None, fail: Exception | None = None):
+        self.scores = scores or _SCORES
+        self.fail = fail
+        self.prompts: list[str] = []
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str, *, timeout: float) -> LLMReply:
+        with self._lock:
+            self.prompts.append(prompt)
+        if self.fail is not None:
+            raise self.fail
+        return LLMReply(_reply_for(prompt, self.scores), prompt_tokens=100, completion_tokens=20)
+
+
+class TestLLMScorer(unittest.TestCase):
+    def test_llm_scores_used(self):
+        scorer = LLMScorer(StubClient())
+        res = scorer.score("# Lib\nA tool.\n")
+        self.assertEqual(res.backend, "llm")
+        self.assertEqual(res.scores["problem_clarity"].score, 8.0)
+        self.assertEqual(res.scores["execution_quality"].why, "Install only.")
+        self.assertEqual(scorer.stats.requests, 2)
+
+    def test_cache_hits_on_repeat(self):
+        client = StubClient()
+        scorer = LLMScorer(client)
+        scorer.score("# Lib\nA tool.\n")
+        scorer.score("# Lib\nA tool.\n")
+        self.assertEqual(len(client.prompts), 2)
+        self.assertEqual(scorer.stats.cache_hits, 2)
+
+    def test_timeout_falls_back_to_heuristic(self):
+        scorer = LLMScorer(StubClient(fail=TimeoutError("timed out")))
+        res = scorer.score("# Lib\nA tool.\n")
+        self.assertEqual(res.backend, "heuristic")
+        self.assertIn("TimeoutError", res.error)
+        self.assertEqual(scorer.stats.fallbacks, 1)
+
+    def test_out_of_range_score_falls_back(self):
+        bad = dict(_SCORES, problem_clarity={"score": 42, "reason": "?"})
+        res = LLMScorer(StubClient(scores=bad)).score("# Lib\n")
+        self.assertEqual(res.backend, "heuristic")
+        self.assertIn("between 0 and 10", res.error)
+
+    def test_bad_replies_not_cached(self):
+        client = StubClient(scores=dict(_SCORES, problem_clarity={"score": 42, "reason": "?"}))
+        cache = ResponseCache()
+        scorer = LLMScorer(client, cache=cache)
+        self.assertEqual(scorer.score("# Lib\n").backend, "heuristic")
+        self.assertEqual(len(client.prompts), 2)  # evidence stage parsed, so it's cached
+
+        client.scores = _SCORES  # the endpoint recovers: the scores stage is retried
+        res = scorer.score("# Lib\n")
+        self.assertEqual(res.backend, "llm")
+        self.assertEqual(len(client.prompts), 3)
+        self.assertEqual(scorer.stats.cache_hits, 1)
+
+    def test_unparseable_reply_not_cached(self):
+        class Overloaded(StubClient):
+            def complete(self, prompt, *, timeout):
+                super().complete(prompt, timeout=timeout)
+                return LLMReply("sorry, overloaded", prompt_tokens=1, completion_tokens=1)
+
+        client = Overloaded()
+        scorer = LLMScorer(client)
+        scorer.score("# Lib\n")
+        scorer.score("# Lib\n")
+        self.assertEqual(len(client.prompts), 2)
+        self.assertEqual(scorer.stats.cache_hits, 0)
+
+    def test_fallback_uses_callers_heuristic_result(self):
+        from evaluator import evaluate_readme
+
+        readme = "# Lib\nA tool.\n"
+        ev = evaluate_readme(readme, docs_text="## Install\n```\npip install lib\n```\n")
+        res = LLMScorer(StubClient(fail=TimeoutError("timed out"))).score(readme, fallback=ev)
+        self.assertEqual(res.backend, "heuristic")
+        self.assertIs(res.scores, ev.scores)
+
+    def test_cost_counter(self):
+        scorer = LLMScorer(StubClient(), price_per_1k_prompt=1.0, price_per_1k_completion=2.0)
+        scorer.score("# Lib\n")
+        # 2 requests x (100 * 1.0 + 20 * 2.0) / 1000
+        self.assertAlmostEqual(scorer.stats.cost_usd, 0.28)
+
+    def test_batches_respect_token_budget(self):
+        scorer = LLMScorer(StubClient(), token_budget=1200)
+        texts = ["x" * 2000] * 5
+        batches = scorer.plan_batches(texts)
+        self.assertEqual(sum(len(b) for b in batches), 5)
+        self.assertGreater(len(batches), 1)
+
+    def test_score_many_preserves_order(self):
+        scorer = LLMScorer(StubClient(), max_workers=3)
+        texts = [f"# Lib {i}\n" for i in range(6)]
+        results = scorer.score_many(texts)
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(r.backend == "llm" for r in results))
+
+
+class TestBatchWithLLM(unittest.TestCase):
+    """run_batch sends each evaluated README through score_many."""
+
+    def setUp(self):
+        import github_fetcher
+        from test_transport import _FakeTransport
+
+        pages = {}
+        for i in range(4):
+            url = f"https://raw.githubusercontent.com/o/r{i}/main/README.md"
+            pages[url] = f"# R{i % 2}\nA tool.\n".encode("utf-8")
+        self.previous = github_fetcher.set_transport(_FakeTransport(pages))
+
+    def tearDown(self):
+        import github_fetcher
+
+        github_fetcher.set_transport(self.previous)
+
+    def test_unique_readmes_scored_once(self):
+        from batch import run_batch
+
+        client = StubClient()
+        scorer = LLMScorer(client, price_per_1k_prompt=1.0)
+        records, summary = run_batch([f"o/r{i}" for i in range(4)] + ["o/missing"], llm_scorer=scorer)
+        self.assertEqual(summary.evaluations, 2)
+        readme_prompts = [p for p in client.prompts if "Signals:\n" not in p]
+        self.assertEqual(len(readme_prompts), 2)
+        scored = [r for r in records if "error" not in r]
+        self.assertEqual(len(scored), 4)
+        self.assertTrue(all(r["scorer"] == "llm" for r in scored))
+        self.assertTrue(all(r["scores"]["problem_clarity"]["score"] == 8.0 for r in scored))
+        self.assertAlmostEqual(scorer.stats.cost_usd, scorer.stats.requests * 0.1)
+
+    def test_fallback_keeps_heuristic_scores(self):
+        from batch import run_batch
+
+        plain, _ = run_batch(["o/r0"])
+        scorer = LLMScorer(StubClient(fail=TimeoutError("timed out")))
+        records, _ = run_batch(["o/r0"], llm_scorer=scorer)
+        self.assertEqual(records[0]["scorer"], "heuristic")
+        self.assertEqual(records[0]["scores"], plain[0]["scores"])
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_key_depends_on_template_and_text(self):
+        self.assertNotEqual(ResponseCache.key("a", "b"), ResponseCache.key("a", "c"))
+        self.assertNotEqual(ResponseCache.key("a", "b"), ResponseCache.key("b", "b"))
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        req = json.loads(self.rfile.read(length))
+        body = json.dumps(
+            {
+                "text": _reply_for(req["prompt"], _SCORES),
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpLLMClient(unittest.TestCase):
+    def test_against_local_stub_server(self):
+        server = HTTPServer(("127.0.0.1", 0), _StubHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/complete"
+            scorer = LLMScorer(HttpLLMClient(url), timeout=5)
+            res = scorer.score("# Lib\nA tool.\n")
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(res.backend, "llm")
+        self.assertEqual(scorer.stats.prompt_tokens, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -74,5 +74,26 @@ class TestJsonOutputSchema(unittest.TestCase):
             self.assertIsInstance(val["why"], str)
 
 
+class TestDimensionsFilter(unittest.TestCase):
+    """--dimensions scores a subset; overall needs all four, so it's null."""
+
+    def test_partial_dimensions(self):
+        with patch("github_fetcher.fetch_readme", return_value=_FAKE_README):
+            captured = io.StringIO()
+            old_stdout = sys.stdout
+            sys.stdout = captured
+            try:
+                from main import main
+                main([
+                    "score", "--repo", "test/repo", "--format", "json",
+                    "--dimensions", "execution_quality,problem_clarity",
+                ])
+            finally:
+                sys.stdout = old_stdout
+        data = json.loads(captured.getvalue())
+        self.assertEqual(list(data["scores"]), ["problem_clarity", "execution_quality"])
+        self.assertIsNone(data["overall"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+"""Tests for markdown_doc (offline, synthetic Markdown)."""
+from __future__ import annotations
+
+import time
+import unittest
+
+from evaluator import evaluate_readme
+from github_fetcher import extract_docs_url
+from markdown_doc import parse_markdown
+
+
+class TestFencedBlocks(unittest.TestCase):
+    def test_balanced_fences(self):
+        doc = parse_markdown("```python\nx = 1\n```\n~~~\ny\n~~~\n")
+        self.assertEqual(len(doc.code_blocks), 2)
+        self.assertEqual(doc.code_blocks[0].info, "python")
+
+    def test_nested_fence_counts_once(self):
+        # A ```` block that shows a ``` example is one code block, not two.
+        text = "````markdown\n```bash\nnpm i\n```\n````\n"
+        doc = parse_markdown(text)
+        self.assertEqual(len(doc.code_blocks), 1)
+        self.assertTrue(doc.code_blocks[0].closed)
+
+    def test_unclosed_fence_runs_to_end(self):
+        doc = parse_markdown("intro\n```\ncode\n# not a heading\n- not a bullet\n")
+        self.assertEqual(len(doc.code_blocks), 1)
+        self.assertFalse(doc.code_blocks[0].closed)
+        self.assertEqual(doc.headings, [])
+        self.assertEqual(doc.bullets, 0)
+
+    def test_fence_inside_list_item(self):
+        text = "1. Clone:\n\n    ```bash\n    git clone x\n    # not a heading\n    ```\n2. Run\n"
+        doc = parse_markdown(text)
+        self.assertEqual([(b.info, b.start_line, b.end_line) for b in doc.code_blocks], [("bash", 2, 5)])
+        self.assertEqual(doc.headings, [])
+        self.assertEqual(doc.steps, 2)
+
+    def test_indented_fence_outside_a_list_is_code(self):
+        # After the list has ended, a 4-space ``` is indented code, not a fence.
+        doc = parse_markdown("- item\n\nProse.\n\n    ```\n    x\n    ```\n")
+        self.assertEqual(doc.code_blocks, [])
+
+    def test_fence_in_block_quote(self):
+        doc = parse_markdown("> ```sh\n> make\n> ```\n")
+        self.assertEqual(len(doc.code_blocks), 1)
+        self.assertTrue(doc.code_blocks[0].closed)
+
+    def test_inline_triple_backticks_are_not_fences(self):
+        doc = parse_markdown("Use ``` to start a block.\n```js``` inline\n")
+        self.assertEqual(len(doc.code_blocks), 0)
+
+
+class TestStructure(unittest.TestCase):
+    def test_headings_atx_and_setext(self):
+        doc = parse_markdown("# Title\nPara\n## Install\nUsage\n-----\n")
+        self.assertEqual([(h.level, h.text) for h in doc.headings], [(1, "Title"), (2, "Install"), (2, "Usage")])
+
+    def test_setext_needs_a_paragraph_above(self):
+        doc = parse_markdown("- item\n---\n\n---\nTitle\r\n===\r\n")
+        self.assertEqual([(h.level, h.text, h.line) for h in doc.headings], [(1, "Title", 4)])
+
+    def test_list_items(self):
+        doc = parse_markdown("- a\n* b\n• c\n1. one\n2) two\nStep 3: three\n")
+        self.assertEqual(doc.bullets, 3)
+        self.assertEqual(doc.steps, 3)
+
+    def test_links_images_and_urls(self):
+        doc = parse_markdown(
+            "[![ci](https://img.shields.io/x)](https://ci.example.com) "
+            "see [Docs](https://example.com/docs) or https://example.com/other.\n"
+        )
+        self.assertEqual([i.url for i in doc.images], ["https://img.shields.io/x"])
+        self.assertEqual([l.url for l in doc.links], ["https://ci.example.com", "https://example.com/docs"])
+        self.assertEqual(doc.urls[-1].url, "https://example.com/other")
+
+    def test_unclosed_links_and_images_stay_linear(self):
+        # Each opener used to rescan to the end of the line: 40KB took ~30s.
+        for unit in ("![](", "[a](", "[![](", "![!["):
+            t0 = time.perf_counter()
+            doc = parse_markdown(unit * 10_000)
+            self.assertLess(time.perf_counter() - t0, 1.0, unit)
+            self.assertEqual((doc.links, doc.images), ([], []))
+
+    def test_urls_in_code_blocks_ignored(self):
+        text = "## Documentation\nSee below.\n```\ncurl https://example.com/docs/install.sh\n```\n"
+        self.assertIsNone(extract_docs_url(text))
+
+
+class TestEvaluatorUsesModel(unittest.TestCase):
+    def test_code_comment_is_not_a_title(self):
+        ev = evaluate_readme("Intro.\n```bash\n# install deps\nmake\n```\n")
+        self.assertEqual(ev.signals["has_title"], 0)
+        self.assertEqual(ev.signals["code_blocks"], 1)
+
+    def test_setext_title_counts(self):
+        body = "A CLI that syncs dotfiles.\n"
+        setext, plain = evaluate_readme("Tool\n====\n" + body), evaluate_readme(body)
+        self.assertEqual(setext.signals["has_title"], 1)
+        self.assertEqual(plain.signals["has_title"], 0)
+        self.assertEqual(
+            setext.scores["problem_clarity"].score, plain.scores["problem_clarity"].score + 1.0
+        )
+        # A "Tool / ---" pair is a level-2 heading, not a title.
+        self.assertEqual(evaluate_readme("Tool\n----\n" + body).signals["has_title"], 0)
+
+    def test_fences_nested_in_numbered_steps(self):
+        text = (
+            "# Tool\n\nA CLI that syncs dotfiles.\n\n## Install\n\n"
+            "1. Clone it:\n\n    ```bash\n    git clone https://github.com/o/tool\n    ```\n\n"
+            "2. Run the installer:\n\n    ```bash\n    ./install.sh\n    ```\n"
+        )
+        ev = evaluate_readme(text)
+        self.assertEqual(ev.signals["code_blocks"], 2)
+        self.assertEqual(ev.scores["execution_quality"].score, 7.5)
+
+    def test_shared_doc_gives_same_result(self):
+        text = "# Lib\n[Docs](https://lib.dev/docs)\n1. a\n2. b\n```\nx\n```\n"
+        doc = parse_markdown(text)
+        self.assertEqual(extract_docs_url(text, doc=doc), "https://lib.dev/docs")
+        shared, fresh = evaluate_readme(text, doc=doc), evaluate_readme(text)
+        self.assertEqual(shared.signals, fresh.signals)
+        self.assertEqual(shared.scores, fresh.scores)
+        self.assertLess(shared.signal_cost, fresh.signal_cost)  # parse not paid twice
+
+
+if __name__ == "__main__":
+    unittest.main()
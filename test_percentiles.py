@@ -0,0 +1,99 @@
+"""Tests for percentiles (offline, synthetic score payloads)."""
+from __future__ import annotations
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from percentiles import KLLSketch, Ranker, ReferenceSketches
+
+
+def _payload(overall: float, dim: float) -> dict:
+    return {
+        "overall": overall,
+        "scores": {
+            d: {"score": dim, "why": ""}
+            for d in ("problem_clarity", "novelty_trend_fit", "distribution_potential", "execution_quality")
+        },
+    }
+
+
+class TestKLLSketch(unittest.TestCase):
+    def test_exact_when_small(self):
+        sk = KLLSketch(k=200)
+        for v in range(100):
+            sk.update(v)
+        self.assertEqual(Ranker(sk).percentile_rank(50), 50.5)
+
+    def test_rank_error_bounded_and_space_small(self):
+        rng = random.Random(7)
+        data = [rng.random() * 10 for _ in range(50_000)]
+        sk = KLLSketch(k=200)
+        for v in data:
+            sk.update(v)
+        self.assertLess(sum(len(level) for level in sk.levels), 1000)
+        ranker = Ranker(sk)
+        ordered = sorted(data)
+        for q in (1.0, 5.0, 9.0):
+            true = 100.0 * sum(1 for v in ordered if v < q) / len(ordered)
+            self.assertAlmostEqual(ranker.percentile_rank(q), true, delta=2.0)
+
+    def test_merge_matches_single_sketch(self):
+        rng = random.Random(11)
+        data = [rng.gauss(5, 2) for _ in range(20_000)]
+        whole, left, right = KLLSketch(), KLLSketch(seed=1), KLLSketch(seed=2)
+        for v in data:
+            whole.update(v)
+        for v in data[:7_000]:
+            left.update(v)
+        for v in data[7_000:]:
+            right.update(v)
+        left.merge(right)
+        self.assertEqual(left.n, len(data))
+        self.assertAlmostEqual(
+            Ranker(left).percentile_rank(5.0), Ranker(whole).percentile_rank(5.0), delta=2.0
+        )
+
+    def test_empty_sketch(self):
+        self.assertIsNone(Ranker(KLLSketch()).percentile_rank(5.0))
+
+
+class TestReferenceSketches(unittest.TestCase):
+    def test_percentiles_for_payload(self):
+        ref = ReferenceSketches()
+        for v in (3.0, 4.0, 5.0, 6.0):
+            ref.add_payload(_payload(v, v))
+        pct = ref.percentiles(_payload(5.0, 6.0))
+        self.assertEqual(pct["overall"], 62.5)
+        self.assertEqual(pct["execution_quality"], 87.5)
+
+    def test_save_load_and_shard_merge(self):
+        a, b = ReferenceSketches(), ReferenceSketches()
+        a.add_payload(_payload(3.0, 3.0))
+        b.add_payload(_payload(7.0, 7.0))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ref.json")
+            b.save(path)
+            a.merge(ReferenceSketches.load(path))
+        self.assertEqual(a.n, 2)
+        self.assertEqual(a.percentiles(_payload(5.0, 5.0))["overall"], 50.0)
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ReferenceSketches.from_dict({"format": "other", "version": 1, "sketches": {}})
+
+    def test_error_records_skipped(self):
+        from percentiles import iter_result_payloads
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(_payload(5.0, 5.0)) + "\n")
+                f.write(json.dumps({"repo": "x/y@main", "error": "nope"}) + "\n")
+            self.assertEqual(len(list(iter_result_payloads([path]))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Tests for sectioniser (offline, synthetic READMEs)."""
+from __future__ import annotations
+
+import unittest
+
+from evaluator import evaluate_readme
+from llm_scorer import fill_where
+from markdown_doc import parse_markdown
+from sectioniser import build_section_tree, select_sections, where_at
+
+
+_README = (
+    "[![ci](https://img.shields.io/badge/ci-ok-green)](x)\n"
+    "# MyLib\n"
+    "TL;DR: a fast tool for X.\n"
+    "## Installation\n"
+    "pip install mylib\n"
+    "### macOS\n"
+    "brew install mylib\n"
+    "## Usage\n"
+    "```bash\n"
+    "# not a heading\n"
+    "mylib run\n"
+    "```\n"
+    "## Changelog\n"
+    + "- fixed a thing\n" * 400
+    + "Demo\n"
+    "----\n"
+    "![demo](https://example.com/demo.gif)\n"
+)
+
+
+class TestSectionTree(unittest.TestCase):
+    def test_heading_tree_and_offsets(self):
+        root, data = build_section_tree(_README)
+        (lib,) = root.children
+        self.assertEqual(lib.title, "MyLib")
+        self.assertEqual(
+            [c.title for c in lib.children], ["Installation", "Usage", "Changelog", "Demo"]
+        )
+        install = lib.children[0]
+        self.assertEqual(install.children[0].title, "macOS")
+        self.assertTrue(data[install.start :].startswith(b"## Installation"))
+
+    def test_fenced_hash_is_not_a_heading(self):
+        root, _ = build_section_tree(_README)
+        titles = [s.title for s in root.walk()]
+        self.assertNotIn("not a heading", titles)
+
+    def test_byte_offsets_with_multibyte_text(self):
+        text = "# Café ☕\nintro\n## Install\npip install x\n"
+        root, data = build_section_tree(text)
+        install = root.children[0].children[0]
+        self.assertTrue(data[install.start :].startswith(b"## Install"))
+
+    def test_headings_follow_the_document_model(self):
+        # One rule set: fenced "# ..." lines aren't headings, an emphasised
+        # paragraph over "---" is one.
+        text = "# Tool\n1. Run:\n\n   ```bash\n   # not a heading\n   ```\n*Fast* usage\n---\nx\n"
+        root, _ = build_section_tree(text)
+        doc = parse_markdown(text)
+        self.assertEqual([s.title for s in root.walk() if s.level], [h.text for h in doc.headings])
+        self.assertEqual([s.title for s in root.walk() if s.level], ["Tool", "*Fast* usage"])
+
+    def test_crlf_offsets(self):
+        root, data = build_section_tree("# A\r\nintro\r\n## Install\r\npip\r\n")
+        install = root.children[0].children[0]
+        self.assertTrue(data[install.start :].startswith(b"## Install\n"))
+
+    def test_where_at(self):
+        root, data = build_section_tree(_README)
+        self.assertEqual(where_at(root, data.find(b"brew install")), "install")
+        self.assertEqual(where_at(root, data.find(b"TL;DR")), "top section")
+        self.assertEqual(where_at(root, data.find(b"mylib run")), "usage")
+        self.assertIsNone(where_at(root, data.find(b"fixed a thing")))
+
+
+class TestSelectSections(unittest.TestCase):
+    def test_skips_irrelevant_sections(self):
+        sel = select_sections(_README, max_chars=2000)
+        self.assertNotIn("fixed a thing", sel.text)
+        self.assertEqual(
+            [w for w, _ in sel.parts],
+            ["top section", "top section", "install", "usage", "demo"],
+        )
+
+    def test_budget_prefers_intro_and_install(self):
+        sel = select_sections(_README, max_chars=120)
+        self.assertLessEqual(len(sel.text), 120)
+        self.assertIn("TL;DR", sel.text)
+        self.assertNotIn("demo.gif", sel.text)
+
+    def test_dimension_filter(self):
+        sel = select_sections(_README, dimensions=["execution_quality"], max_chars=2000)
+        self.assertEqual({w for w, _ in sel.parts}, {"install", "usage"})
+
+    def test_evaluator_consumes_selection(self):
+        full = evaluate_readme(_README)
+        small = evaluate_readme(_README, max_chars=1000)
+        self.assertEqual(full.signals["bullets"], 400)
+        self.assertEqual(small.signals["bullets"], 0)
+        self.assertEqual(small.signals["has_install"], 1)
+        self.assertEqual(small.signals["has_demo"], 1)
+
+    def test_truncated_fence_is_closed(self):
+        # Usage is cut mid-fence; restored to document order, an unclosed
+        # fence would swallow the Installation section after it.
+        usage = "## Usage\n```bash\n" + "".join(f"tool run --flag {i}\n" for i in range(60)) + "```\n"
+        install = "## Installation\n1. Clone\n2. Build\n3. Run\n```bash\nmake\n```\n```bash\nmake install\n```\n"
+        text = "# Tool\nA tool.\n" + usage + install
+        full = evaluate_readme(text)
+        for max_chars in (400, 600, 900):
+            sel = select_sections(text, max_chars=max_chars)
+            self.assertLessEqual(len(sel.text), max_chars)
+            self.assertTrue(all(b.closed for b in parse_markdown(sel.text).code_blocks))
+            ev = evaluate_readme(text, max_chars=max_chars)
+            self.assertEqual(ev.signals["step_lines"], 3)
+            self.assertEqual(ev.scores["execution_quality"].score, full.scores["execution_quality"].score)
+
+    def test_evaluator_selects_for_requested_dimensions(self):
+        ev = evaluate_readme(_README, max_chars=100, dimensions=["execution_quality"])
+        # The budget goes to install/usage, not the intro's badge and TL;DR.
+        self.assertEqual(ev.signals["has_install"], 1)
+        self.assertEqual(ev.signals["code_blocks"], 1)
+
+    def test_shared_doc_gives_same_selection(self):
+        doc = parse_markdown(_README)
+        self.assertEqual(select_sections(_README, max_chars=1000, doc=doc), select_sections(_README, max_chars=1000))
+        shared, fresh = evaluate_readme(_README, max_chars=1000, doc=doc), evaluate_readme(_README, max_chars=1000)
+        self.assertEqual(shared.signals, fresh.signals)
+
+    def test_fill_where_from_quotes(self):
+        evidence = {
+            "execution_quality": [{"cue": "install", "quote": "brew install mylib", "where": "faq"}],
+        }
+        fill_where(evidence, _README)
+        self.assertEqual(evidence["execution_quality"][0]["where"], "install")
+
+
+if __name__ == "__main__":
+    unittest.main()
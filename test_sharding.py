@@ -0,0 +1,242 @@
+"""Tests for sharding and shard merge (offline: replay cassette, local processes)."""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from sharding import parse_shard, select_shard, shard_of
+from test_transport import _FakeTransport
+from transport import RecordingTransport
+
+
+_REPOS = [f"owner{i % 7}/repo-{i}" for i in range(2000)]
+
+
+class TestShardAssignment(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for bad in ("4/4", "-1/4", "x/4", "3"):
+            with self.assertRaises(ValueError):
+                parse_shard(bad)
+
+    def test_partition_is_complete_and_disjoint(self):
+        shards = [select_shard(_REPOS, i, 4) for i in range(4)]
+        self.assertEqual(sorted(sum(shards, [])), sorted(_REPOS))
+        for shard in shards:
+            # Roughly balanced: each shard within 40% of the fair share.
+            self.assertLess(abs(len(shard) - 500), 200)
+
+    def test_case_insensitive(self):
+        self.assertEqual(shard_of("Owner/Repo", 8), shard_of("owner/repo", 8))
+
+    def test_adding_a_node_moves_few_repos(self):
+        before = {r: shard_of(r, 4) for r in _REPOS}
+        after = {r: shard_of(r, 5) for r in _REPOS}
+        moved = [r for r in _REPOS if before[r] != after[r]]
+        # Only repos captured by the new shard move (~1/5 of them).
+        self.assertTrue(all(after[r] == 4 for r in moved))
+        self.assertLess(len(moved) / len(_REPOS), 0.3)
+
+
+class TestShardedRunAndMerge(unittest.TestCase):
+    """N local `batch --shard i/N` processes + `merge` == one unsharded run."""
+
+    N = 3
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        repos = [f"o/r{i}" for i in range(12)]
+        pages = {}
+        for i, repo in enumerate(repos):
+            url = f"https://raw.githubusercontent.com/{repo}/main/README.md"
+            body = f"# R{i % 4}\nA tool.\n" + ("## Install\npip install r\n" if i % 2 else "")
+            pages[url] = body.encode("utf-8")
+        self.cassette = os.path.join(self.dir, "cassette.jsonl")
+        rec = RecordingTransport(self.cassette, _FakeTransport(pages))
+        for url in pages:
+            rec.get(url, {}, 5)
+        self.repo_file = os.path.join(self.dir, "repos.txt")
+        with open(self.repo_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(repos) + "\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _main(self, *args: str) -> subprocess.Popen:
+        here = os.path.dirname(os.path.abspath(__file__))
+        return subprocess.Popen(
+            [sys.executable, os.path.join(here, "main.py"), *args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+
+    def _wait(self, procs):
+        for p in procs:
+            _, err = p.communicate(timeout=60)
+            self.assertEqual(p.returncode, 0, err.decode("utf-8", errors="replace"))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def test_shards_merge_to_single_run(self):
+        common = ["batch", "--repos", self.repo_file, "--replay", self.cassette]
+        procs = [
+            self._main(
+                *common,
+                "--shard", f"{i}/{self.N}",
+                "--out", self._path(f"shard{i}.jsonl"),
+                "--summary-out", self._path(f"summary{i}.json"),
+                "--reference-out", self._path(f"ref{i}.json"),
+            )
+            for i in range(self.N)
+        ]
+        procs.append(
+            self._main(
+                *common,
+                "--out", self._path("single.jsonl"),
+                "--summary-out", self._path("single_summary.json"),
+            )
+        )
+        self._wait(procs)
+
+        self._wait([
+            self._main(
+                "merge",
+                "--results", *[self._path(f"shard{i}.jsonl") for i in range(self.N)],
+                "--out", self._path("merged.jsonl"),
+                "--summaries", *[self._path(f"summary{i}.json") for i in range(self.N)],
+                "--summary-out", self._path("merged_summary.json"),
+                "--references", *[self._path(f"ref{i}.json") for i in range(self.N)],
+                "--reference-out", self._path("merged_ref.json"),
+            )
+        ])
+
+        def load(name):
+            with open(self._path(name), encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+
+        def comparable(records):
+            # dedupe reuse/cluster bookkeeping legitimately differs per shard.
+            return sorted(
+                (r["repo"], r["overall"], json.dumps(r["scores"], sort_keys=True)) for r in records
+            )
+
+        merged, single = load("merged.jsonl"), load("single.jsonl")
+        self.assertEqual(len(merged), 12)
+        self.assertEqual(comparable(merged), comparable(single))
+
+        # Dedupe blocks are rebuilt over the merged set: same clusters as the
+        # single run; reused_from names the first holder in merged (repo) order.
+        def clusters(records):
+            return sorted((r["repo"], r["dedupe"]["cluster_id"], r["dedupe"]["cluster_size"]) for r in records)
+
+        self.assertEqual(clusters(merged), clusters(single))
+        seen = set()
+        for r in merged:
+            d = r["dedupe"]
+            if d["content_hash"] in seen:
+                self.assertIsNotNone(d["reused_from"])
+            else:
+                self.assertIsNone(d["reused_from"])
+                seen.add(d["content_hash"])
+
+        with open(self._path("merged_summary.json"), encoding="utf-8") as f:
+            summary = json.load(f)
+        with open(self._path("single_summary.json"), encoding="utf-8") as f:
+            single_summary = json.load(f)
+        self.assertEqual(summary["shards"], self.N)
+        self.assertEqual(summary["fetched"], 12)
+        self.assertEqual(summary["unique_readmes"], 4)
+        for key in ("clusters", "evaluations", "reused_exact", "reused_near"):
+            self.assertEqual(summary[key], single_summary[key], key)
+
+        from percentiles import ReferenceSketches
+
+        self.assertEqual(ReferenceSketches.load(self._path("merged_ref.json")).n, 12)
+
+    def test_error_record_replaced_by_success(self):
+        from batch import merge_results, merge_summaries
+
+        a, b = self._path("a.jsonl"), self._path("b.jsonl")
+        with open(a, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"repo": "o/x@main", "error": "timeout"}) + "\n")
+        with open(b, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"repo": "o/x@main", "overall": 5.0}) + "\n")
+            f.write(json.dumps({"repo": "o/a@main", "overall": 4.0}) + "\n")
+        merged = merge_results([a, b])
+        self.assertEqual([r["repo"] for r in merged], ["o/a@main", "o/x@main"])
+        self.assertNotIn("error", merged[1])
+
+        summary = merge_summaries(
+            [{"repos": 1, "fetched": 0, "fetch_errors": 1}, {"repos": 2, "fetched": 2, "fetch_errors": 0}],
+            merged,
+        )
+        self.assertEqual((summary["repos"], summary["fetched"], summary["fetch_errors"]), (2, 2, 0))
+
+    def test_merge_rebuilds_dedupe_across_shards(self):
+        from batch import merge_results, merge_summaries
+
+        def rec(repo, h, cid, size, reused_from):
+            return {
+                "repo": f"{repo}@main",
+                "overall": 5.0,
+                "dedupe": {"content_hash": h, "cluster_id": cid, "cluster_size": size, "reused_from": reused_from},
+            }
+
+        a, b = self._path("a.jsonl"), self._path("b.jsonl")
+        with open(a, "w", encoding="utf-8") as f:
+            # Shard a: o/b is a near duplicate of o/a and reused its scores.
+            f.write(json.dumps(rec("o/a", "aaaa", "aaaa", 2, None)) + "\n")
+            f.write(json.dumps(rec("o/b", "bbbb", "aaaa", 2, "o/a")) + "\n")
+        with open(b, "w", encoding="utf-8") as f:
+            # Shard b saw o/c alone, but it's the same README as o/a.
+            f.write(json.dumps(rec("o/c", "aaaa", "aaaa", 1, None)) + "\n")
+            f.write(json.dumps(rec("o/d", "dddd", "dddd", 1, None)) + "\n")
+
+        merged = {r["repo"]: r["dedupe"] for r in merge_results([a, b])}
+        self.assertEqual(merged["o/a@main"]["cluster_size"], 3)
+        self.assertIsNone(merged["o/a@main"]["reused_from"])
+        self.assertEqual(merged["o/b@main"]["reused_from"], "o/a")
+        self.assertEqual(merged["o/c@main"]["reused_from"], "o/a")
+        self.assertEqual(merged["o/d@main"]["cluster_size"], 1)
+
+        summary = merge_summaries(
+            [{"clusters": 1, "evaluations": 1}, {"clusters": 2, "evaluations": 2}],
+            merge_results([a, b]),
+        )
+        self.assertEqual(summary["clusters"], 2)
+        self.assertEqual(summary["evaluations"], 2)
+        self.assertEqual(summary["reused_exact"], 1)
+        self.assertEqual(summary["reused_near"], 1)
+
+    def test_near_duplicates_on_different_shards_stay_separate(self):
+        from batch import merge_results
+
+        def rec(repo, h):
+            return {
+                "repo": f"{repo}@main",
+                "overall": 5.0,
+                "dedupe": {"content_hash": h, "cluster_id": h, "cluster_size": 1, "reused_from": None},
+            }
+
+        a, b = self._path("a.jsonl"), self._path("b.jsonl")
+        # o/a and o/b are near duplicates, but each shard saw only one of them:
+        # nothing in the records links them, so merge can't join them.
+        with open(a, "w", encoding="utf-8") as f:
+            f.write(json.dumps(rec("o/a", "aaaa")) + "\n")
+        with open(b, "w", encoding="utf-8") as f:
+            f.write(json.dumps(rec("o/b", "bbbb")) + "\n")
+
+        merged = {r["repo"]: r["dedupe"] for r in merge_results([a, b])}
+        self.assertNotEqual(merged["o/a@main"]["cluster_id"], merged["o/b@main"]["cluster_id"])
+        self.assertEqual(merged["o/b@main"]["cluster_size"], 1)
+        self.assertIsNone(merged["o/b@main"]["reused_from"])
+
+
+if __name__ == "__main__":
+    unittest.main()
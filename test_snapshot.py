@@ -0,0 +1,121 @@
+"""Tests for snapshot (offline, synthetic batch records)."""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from batch import DIM_ORDER
+from snapshot import Snapshot, default_signal_keys, write_snapshot
+
+try:
+    import numpy
+except ImportError:  # optional: only Snapshot.to_numpy needs it
+    numpy = None
+
+
+def _record(repo: str, overall: float | None, dim: float, signals: dict) -> dict:
+    return {
+        "version": "0.3.0",
+        "repo": repo,
+        "overall": overall,
+        "scores": {d: {"score": dim, "why": "because"} for d in DIM_ORDER},
+        "signals": signals,
+    }
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "results.snap")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        full = dict.fromkeys(default_signal_keys(), 0) | {"bullets": 7, "has_title": 1}
+        records = [
+            _record("a/one@main", 6.35, 6.5, full),
+            {"repo": "b/missing@main", "error": "HTTP 404"},
+            _record("ç/ünïcode@main", 2.0, 1.5, full | {"bullets": 0}),
+        ]
+        self.assertEqual(write_snapshot(self.path, records), 2)
+        with Snapshot(self.path) as snap:
+            self.assertEqual(len(snap), 2)
+            self.assertEqual(snap.dims, DIM_ORDER)
+            self.assertEqual(snap.signal_keys, default_signal_keys())
+            self.assertEqual(snap.repo(1), "ç/ünïcode@main")
+            self.assertEqual(snap.overall(0), 6.35)
+            self.assertEqual(snap.score(1, "execution_quality"), 1.5)
+            self.assertEqual(snap.signal(0, "bullets"), 7)
+            self.assertEqual(snap.column("bullets"), [7, 0])
+            self.assertEqual(snap.find("a/one@main"), 0)
+            self.assertIsNone(snap.find("b/missing@main"))
+            row = snap.row(0)
+            self.assertEqual(row["signals"], full)
+            self.assertEqual(row["scores"]["problem_clarity"], {"score": 6.5})
+
+    def test_partial_run_marks_missing(self):
+        rec = _record("a/b@main", None, 5.0, {"has_title": 1})
+        rec["scores"] = {"problem_clarity": {"score": 5.0, "why": ""}}
+        write_snapshot(self.path, [rec])
+        with Snapshot(self.path) as snap:
+            self.assertIsNone(snap.overall(0))
+            self.assertIsNone(snap.score(0, "execution_quality"))
+            self.assertIsNone(snap.signal(0, "bullets"))
+            self.assertEqual(snap.row(0)["signals"], {"has_title": 1})
+            self.assertEqual(list(snap.row(0)["scores"]), ["problem_clarity"])
+
+    def test_signal_key_set_is_checked(self):
+        write_snapshot(self.path, [_record("a/b@main", 5.0, 5.0, {"x": 1})], signal_keys=["x", "y"])
+        with Snapshot(self.path, signal_keys=["x", "y"]) as snap:
+            self.assertEqual(snap.signal(0, "y"), None)
+        with self.assertRaises(ValueError):
+            Snapshot(self.path, signal_keys=default_signal_keys())
+        with self.assertRaises(ValueError):
+            write_snapshot(self.path, [], signal_keys=["y", "x"])
+
+    def test_rejects_other_files_and_tampered_keys(self):
+        with open(self.path, "wb") as f:
+            f.write(b"{}" * 100)
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+        write_snapshot(self.path, [], signal_keys=["bullets"])
+        with open(self.path, "r+b") as f:
+            data = f.read()
+            f.seek(data.index(b"bullets"))
+            f.write(b"BULLETS")
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
+
+    def test_empty_snapshot(self):
+        write_snapshot(self.path, [])
+        with Snapshot(self.path) as snap:
+            self.assertEqual(len(snap), 0)
+            self.assertEqual(snap.column("overall"), [])
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_numpy_view(self):
+        write_snapshot(self.path, [_record("a/b@main", 4.25, 4.0, {"bullets": 3})])
+        with Snapshot(self.path) as snap:
+            arr = snap.to_numpy()
+            self.assertAlmostEqual(float(arr["overall"][0]), 4.25)
+            self.assertEqual(int(arr["signals"][0][snap.signal_keys.index("bullets")]), 3)
+            del arr  # the array borrows the mapping; drop it before close()
+
+    def test_cli_snapshot_from_results(self):
+        from main import main
+
+        results = os.path.join(self._tmp.name, "results.jsonl")
+        with open(results, "w", encoding="utf-8") as f:
+            for i in range(3):
+                f.write(json.dumps(_record(f"o/r{i}@main", float(i), float(i), {"bullets": i})) + "\n")
+        main(["snapshot", "--results", results, "--out", self.path])
+        with Snapshot(self.path) as snap:
+            self.assertEqual(snap.column("overall"), [0.0, 1.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
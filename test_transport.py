@@ -0,0 +1,158 @@
+"""Tests for transport record/replay (offline: local stub server + cassettes)."""
+from __future__ import annotations
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import github_fetcher
+from transport import HttpResponse, RecordingTransport, ReplayTransport, UrllibTransport
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/big"):
+            # 300 KB; "/big-undeclared" omits Content-Length (read until close).
+            body = b"x" * 300_000
+            self.send_response(200)
+            if self.path == "/big":
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            self.close_connection = True
+            return
+        if self.path == "/README.md":
+            body = b"# Stub\nA tool.\n"
+            self.send_response(200)
+        else:
+            body = b"404: Not Found"
+            self.send_response(404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeTransport:
+    """Inner transport that serves a dict of url -> body (no sockets)."""
+
+    def __init__(self, pages: dict, elapsed: float = 0.0):
+        self.pages = pages
+        self.elapsed = elapsed
+
+    def get(self, url, headers, timeout, max_bytes=None):
+        if url in self.pages:
+            return HttpResponse(url, 200, {"Content-Type": "text/plain"}, self.pages[url], self.elapsed)
+        return HttpResponse(url, 404, {}, b"404: Not Found", self.elapsed)
+
+
+class TestWireCap(unittest.TestCase):
+    def test_oversized_bodies_stop_reading(self):
+        server = HTTPServer(("127.0.0.1", 0), _StubHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        try:
+            transport = UrllibTransport()
+            for path in ("/big", "/big-undeclared"):
+                with self.assertRaises(ValueError):
+                    transport.get(base + path, {}, 5, max_bytes=100_000)
+            self.assertEqual(len(transport.get(base + "/big-undeclared", {}, 5).body), 300_000)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_replay_applies_cap(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cassette = os.path.join(tmp, "c.jsonl")
+            RecordingTransport(cassette, _FakeTransport({"https://x/a": b"y" * 500})).get("https://x/a", {}, 5)
+            replay = ReplayTransport(cassette)
+            with self.assertRaises(ValueError):
+                replay.get("https://x/a", {}, 5, max_bytes=100)
+
+
+class TestRecordReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cassette = os.path.join(self.tmp.name, "cassette.jsonl")
+        self.previous = github_fetcher.get_transport()
+
+    def tearDown(self):
+        github_fetcher.set_transport(self.previous)
+        self.tmp.cleanup()
+
+    def test_record_then_replay_local_server(self):
+        server = HTTPServer(("127.0.0.1", 0), _StubHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        try:
+            rec = RecordingTransport(self.cassette, UrllibTransport())
+            ok = rec.get(f"{base}/README.md", {}, 5)
+            missing = rec.get(f"{base}/nope", {}, 5)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual((ok.status, missing.status), (200, 404))
+
+        # Server is gone; replay must still serve both.
+        replay = ReplayTransport(self.cassette)
+        self.assertEqual(replay.get(f"{base}/README.md", {}, 5).body, b"# Stub\nA tool.\n")
+        self.assertEqual(replay.get(f"{base}/nope", {}, 5).status, 404)
+
+    def test_fetch_readme_through_replay(self):
+        url = "https://raw.githubusercontent.com/o/r/main/README.rst"
+        rec = RecordingTransport(self.cassette, _FakeTransport({url: b"Title\n=====\n"}))
+        github_fetcher.set_transport(rec)
+        github_fetcher.fetch_readme("o/r")
+
+        github_fetcher.set_transport(ReplayTransport(self.cassette))
+        res = github_fetcher.fetch_readme("o/r")
+        self.assertEqual(res.filename, "README.rst")
+        self.assertEqual(res.text, "Title\n=====\n")
+
+    def test_unknown_url_raises_url_error(self):
+        RecordingTransport(self.cassette, _FakeTransport({}))
+        replay = ReplayTransport(self.cassette)
+        with self.assertRaises(urllib.error.URLError):
+            replay.get("https://example.com/x", {}, 5)
+
+    def test_replay_latency(self):
+        url = "https://example.com/docs"
+        RecordingTransport(self.cassette, _FakeTransport({url: b"ok"}, elapsed=0.05)).get(url, {}, 5)
+        fast = ReplayTransport(self.cassette)
+        slow = ReplayTransport(self.cassette, latency=True)
+        t0 = time.perf_counter()
+        fast.get(url, {}, 5)
+        t1 = time.perf_counter()
+        slow.get(url, {}, 5)
+        t2 = time.perf_counter()
+        self.assertLess(t1 - t0, 0.05)
+        self.assertGreaterEqual(t2 - t1, 0.05)
+
+    def test_score_cli_with_replay(self):
+        url = "https://raw.githubusercontent.com/o/r/main/README.md"
+        RecordingTransport(self.cassette, _FakeTransport({url: b"# R\nA tool.\n"})).get(url, {}, 5)
+
+        from main import main
+
+        captured = io.StringIO()
+        old_stdout, sys.stdout = sys.stdout, captured
+        try:
+            main(["score", "--repo", "o/r", "--format", "json", "--replay", self.cassette])
+        finally:
+            sys.stdout = old_stdout
+        self.assertEqual(json.loads(captured.getvalue())["source"], url)
+
+
+if __name__ == "__main__":
+    unittest.main()
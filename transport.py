@@ -0,0 +1,170 @@
+"""
+Pluggable HTTP transport for the fetcher, with record/replay cassettes.
+
+Why this exists:
+- every end-to-end path (fetch_readme, fetch_docs_page, batch) needs live
+  GitHub, which CI and sandboxed perf runs can't rely on
+- benchmarking batch throughput against the live network isn't repeatable
+
+Record mode wraps the real transport and appends each response (status,
+headers, body, timing) to a cassette. Replay mode serves those responses
+locally, optionally sleeping for the recorded latency so throughput
+numbers stay realistic.
+
+Cassette format: JSON lines. First line is a header, then one entry per
+response; bodies are zlib-compressed and base64-encoded to keep it compact.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List
+
+CASSETTE_FORMAT = "wpgs-cassette"
+CASSETTE_VERSION = 1
+_CHUNK = 64 * 1024
+
+
+def _read_capped(fp, max_bytes: int | None, declared: str | None = None) -> bytes:
+    """
+    Read a response body in _CHUNK pieces, failing as soon as it passes
+    max_bytes (or up front, if Content-Length already says it will).
+    """
+    if max_bytes is not None and declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ValueError(f"Response body exceeds {max_bytes} bytes (Content-Length: {declared})")
+    chunks: List[bytes] = []
+    total = 0
+    while True:
+        chunk = fp.read(_CHUNK)
+        if not chunk:
+            break
+        total += len(chunk)
+        if max_bytes is not None and total > max_bytes:
+            raise ValueError(f"Response body exceeds {max_bytes} bytes on the wire")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    elapsed: float  # seconds, request start -> body read
+
+
+class UrllibTransport:
+    """
+    The real network. HTTP error statuses are returned, not raised.
+
+    max_bytes caps the raw (wire) body: it's read in chunks and the read
+    stops with ValueError once the cap is passed, before the rest is buffered.
+    """
+
+    def get(
+        self, url: str, headers: Dict[str, str], timeout: float, max_bytes: int | None = None
+    ) -> HttpResponse:
+        req = urllib.request.Request(url, headers=headers)
+        t0 = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                status = resp.status
+                resp_headers = dict(resp.headers.items())
+                body = _read_capped(resp, max_bytes, resp.headers.get("Content-Length"))
+        except urllib.error.HTTPError as e:
+            status = e.code
+            resp_headers = dict(e.headers.items()) if e.headers else {}
+            body = _read_capped(e, max_bytes) if e.fp is not None else b""
+        return HttpResponse(url, status, resp_headers, body, time.perf_counter() - t0)
+
+
+def _encode_entry(resp: HttpResponse) -> dict:
+    return {
+        "url": resp.url,
+        "status": resp.status,
+        "headers": resp.headers,
+        "body": base64.b64encode(zlib.compress(resp.body, 9)).decode("ascii"),
+        "elapsed": round(resp.elapsed, 6),
+    }
+
+
+def _decode_entry(entry: dict) -> HttpResponse:
+    return HttpResponse(
+        url=entry["url"],
+        status=int(entry["status"]),
+        headers=dict(entry.get("headers") or {}),
+        body=zlib.decompress(base64.b64decode(entry["body"])),
+        elapsed=float(entry.get("elapsed", 0.0)),
+    )
+
+
+class RecordingTransport:
+    """Pass requests to `inner` and append every response to a cassette."""
+
+    def __init__(self, path: str, inner=None) -> None:
+        self.path = path
+        self.inner = inner if inner is not None else UrllibTransport()
+        self._lock = threading.Lock()
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"format": CASSETTE_FORMAT, "version": CASSETTE_VERSION}) + "\n")
+
+    def get(
+        self, url: str, headers: Dict[str, str], timeout: float, max_bytes: int | None = None
+    ) -> HttpResponse:
+        resp = self.inner.get(url, headers, timeout, max_bytes)
+        line = json.dumps(_encode_entry(resp), separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        return resp
+
+
+class ReplayTransport:
+    """
+    Serve responses from a cassette; never touches the network.
+
+    Repeated requests for the same URL are served in recorded order, and
+    the last recording is reused once they run out (so cached/retried
+    paths still work). URLs not in the cassette raise URLError, just like
+    an unreachable host.
+    """
+
+    def __init__(self, path: str, *, latency: bool = False) -> None:
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[HttpResponse]] = {}
+        self._cursor: Dict[str, int] = {}
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != CASSETTE_FORMAT or header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Not a v{CASSETTE_VERSION} {CASSETTE_FORMAT} file: {path}")
+            for line in f:
+                if line.strip():
+                    resp = _decode_entry(json.loads(line))
+                    self._entries.setdefault(resp.url, []).append(resp)
+
+    def get(
+        self, url: str, headers: Dict[str, str], timeout: float, max_bytes: int | None = None
+    ) -> HttpResponse:
+        with self._lock:
+            recorded = self._entries.get(url)
+            if not recorded:
+                raise urllib.error.URLError(f"not in cassette: {url}")
+            i = self._cursor.get(url, 0)
+            self._cursor[url] = i + 1
+        resp = recorded[min(i, len(recorded) - 1)]
+        if max_bytes is not None and len(resp.body) > max_bytes:
+            raise ValueError(f"Response body exceeds {max_bytes} bytes on the wire")
+        if self.latency and resp.elapsed > 0:
+            time.sleep(min(resp.elapsed, timeout))
+        return resp